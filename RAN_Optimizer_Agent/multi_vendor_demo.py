@@ -15,7 +15,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from multi_vendor_environment import MultiVendorEnvironment
 from vendor_ai_simulator import IndependentVendorSimulation, VendorAI
-from coordination_agent import MultiVendorCoordinationAgent
+from coordination_agent import MultiVendorCoordinationAgent, describe_conflict
 
 # Page configuration
 st.set_page_config(
@@ -169,7 +169,7 @@ def show_conflicts(conflicts):
         st.markdown(f"""
         <div class="conflict-box">
         <b>Conflict {i+1}: {conflict['type'].replace('_', ' ').title()}</b><br>
-        {conflict['description']}<br>
+        {describe_conflict(conflict)}<br>
         <small>Severity: {conflict['severity']} | Cells: {conflict['cells']} | Vendors: {conflict['vendors']}</small>
         </div>
         """, unsafe_allow_html=True)
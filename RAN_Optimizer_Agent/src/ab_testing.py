@@ -3,6 +3,7 @@ A/B Testing System to validate changes before full deployment
 """
 
 import numpy as np
+from scipy import stats
 from dataclasses import dataclass
 from typing import List, Dict
 import json
@@ -22,6 +23,70 @@ class TestResult:
     timestamp: str
 
 
+# Metrics compared between groups, the group-performance key each one is
+# read from, and the sign that makes a positive change an improvement
+IMPROVEMENT_KEYS = ('throughput', 'drop_rate', 'satisfaction', 'power')
+GROUP_METRIC_KEYS = ('avg_throughput', 'avg_drop_rate', 'avg_satisfaction', 'total_power')
+IMPROVEMENT_SIGNS = np.array([1.0, -1.0, 1.0, -1.0])
+
+# Weights of the per-metric improvements in the average improvement that
+# drives the recommendation
+AVERAGE_WEIGHTS = np.full(len(IMPROVEMENT_KEYS), 1.0 / len(IMPROVEMENT_KEYS))
+
+# Per-step improvement vectors are buffered and folded into the running
+# statistics this many steps at a time
+STATS_CHUNK_STEPS = 32
+
+
+class RunningStats:
+    """
+    Streaming per-metric statistics (Welford, merged with Chan et al.)
+
+    Keeps n, the per-metric mean (k,) and the co-moment matrix M2 (k, k),
+    whose diagonal is each metric's M2, so samples never need to be stored.
+    Blocks of samples and other RunningStats are folded in with the pairwise
+    merge, in O(k^2) whatever their size.
+    """
+
+    def __init__(self, num_metrics):
+        self.n = 0
+        self.mean = np.zeros(num_metrics)
+        self.m2 = np.zeros((num_metrics, num_metrics))
+
+    def update(self, samples):
+        """Add a block of samples, shape (m, k)"""
+        samples = np.asarray(samples, dtype=float)
+        if not len(samples):
+            return
+        block = RunningStats(samples.shape[1])
+        block.n = len(samples)
+        block.mean = samples.mean(axis=0)
+        centered = samples - block.mean
+        block.m2 = centered.T @ centered
+        self.merge(block)
+
+    def merge(self, other):
+        """Fold the samples summarized by another RunningStats into this one"""
+        if not other.n:
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.n / n)
+        self.m2 = self.m2 + other.m2 + np.outer(delta, delta) * (self.n * other.n / n)
+        self.n = n
+
+    @property
+    def variance(self):
+        """Per-metric sample variance (0 with fewer than 2 samples)"""
+        return np.diag(self.m2) / (self.n - 1) if self.n > 1 else np.zeros(len(self.mean))
+
+    def combined(self, weights):
+        """Mean and sample variance of the weighted sum of the metrics"""
+        mean = float(weights @ self.mean)
+        variance = float(weights @ self.m2 @ weights / (self.n - 1)) if self.n > 1 else 0.0
+        return mean, variance
+
+
 class ABTestingSystem:
     """
     A/B Testing System
@@ -105,6 +170,19 @@ class ABTestingSystem:
         # Apply changes to Group A only
         print(f"\nApplying optimizations to Group A...")
 
+        # Cells are tracked by id because reset() rebuilds env.cells
+        ids_a = [c['id'] for c in group_a]
+        ids_b = [c['id'] for c in group_b]
+        stats_a = RunningStats(len(IMPROVEMENT_KEYS))
+        stats_b = RunningStats(len(IMPROVEMENT_KEYS))
+        initial_a = self._performance_vector(initial_metrics_a)
+        initial_b = self._performance_vector(initial_metrics_b)
+
+        # Per-step improvements of the current chunk, one row per step
+        chunk_a = np.empty((STATS_CHUNK_STEPS, len(IMPROVEMENT_KEYS)))
+        chunk_b = np.empty((STATS_CHUNK_STEPS, len(IMPROVEMENT_KEYS)))
+        filled = 0
+
         state = env.reset()
         for step in range(num_steps):
             # Agent optimizes only Group A cells
@@ -115,10 +193,25 @@ class ABTestingSystem:
                 # Group B: no change
                 state, reward, done, info = env.step(13)  # Action "no change"
 
+            # Per-step improvements of both groups from one pass over the cells
+            values = self._cell_metric_matrix(env.cells, env)
+            chunk_a[filled] = self._improvement(initial_a, self._group_performance(values, ids_a))
+            chunk_b[filled] = self._improvement(initial_b, self._group_performance(values, ids_b))
+            filled += 1
+            if filled == STATS_CHUNK_STEPS:
+                stats_a.update(chunk_a)
+                stats_b.update(chunk_b)
+                filled = 0
+
             if done:
                 state = env.reset()
 
+        stats_a.update(chunk_a[:filled])
+        stats_b.update(chunk_b[:filled])
+
         # Measure performance after changes
+        group_a = [env.cells[i] for i in ids_a]
+        group_b = [env.cells[i] for i in ids_b]
         final_metrics_a = self._measure_group_performance(group_a, env)
         final_metrics_b = self._measure_group_performance(group_b, env)
 
@@ -130,7 +223,8 @@ class ABTestingSystem:
         result = self._analyze_results(
             test_name,
             initial_metrics_a, final_metrics_a,
-            initial_metrics_b, final_metrics_b
+            initial_metrics_b, final_metrics_b,
+            stats_a, stats_b
         )
 
         # Save result
@@ -157,15 +251,60 @@ class ABTestingSystem:
 
     def _measure_group_performance(self, cells, env):
         """Measure performance of a group of cells"""
-        metrics = {
-            'avg_throughput': np.mean([c['throughput'] for c in cells]),
-            'avg_drop_rate': np.mean([c['drop_rate'] for c in cells]),
-            'total_power': np.sum([c['power_consumption'] for c in cells]),
-            'avg_satisfaction': np.mean([env._calculate_satisfaction(c) for c in cells])
-        }
-        return metrics
-
-    def _analyze_results(self, test_name, initial_a, final_a, initial_b, final_b):
+        performance = self._group_performance(self._cell_metric_matrix(cells, env), slice(None))
+        return {key: float(value) for key, value in zip(GROUP_METRIC_KEYS, performance)}
+
+    def _cell_metric_matrix(self, cells, env):
+        """Per-cell throughput, drop rate, satisfaction and power, one row per cell"""
+        return np.array([
+            (c['throughput'], c['drop_rate'], env._calculate_satisfaction(c), c['power_consumption'])
+            for c in cells
+        ], dtype=float)
+
+    def _group_performance(self, values, rows):
+        """Group performance (GROUP_METRIC_KEYS order) from rows of the metric matrix"""
+        group = values[rows]
+        performance = group.mean(axis=0)
+        performance[3] *= len(group)  # Total, not average, power
+        return performance
+
+    def _performance_vector(self, metrics):
+        """Group performance dict as an array in GROUP_METRIC_KEYS order"""
+        return np.array([metrics[k] for k in GROUP_METRIC_KEYS], dtype=float)
+
+    def _improvement(self, initial, final):
+        """Signed percentage improvement of each metric (positive = better)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct = np.where(initial != 0, (final - initial) / initial, 0.0)
+        return pct * IMPROVEMENT_SIGNS * 100
+
+    def _improvement_vector(self, initial, final):
+        """_improvement for group performance dicts"""
+        return self._improvement(self._performance_vector(initial), self._performance_vector(final))
+
+    def _welch_p_value(self, stats_a, stats_b):
+        """
+        One-sided Welch's t-test p-value that group A's average improvement
+        exceeds group B's
+        """
+        mean_a, variance_a = stats_a.combined(AVERAGE_WEIGHTS)
+        mean_b, variance_b = stats_b.combined(AVERAGE_WEIGHTS)
+        var_a = variance_a / max(stats_a.n, 1)
+        var_b = variance_b / max(stats_b.n, 1)
+        se2 = var_a + var_b
+        diff = mean_a - mean_b
+
+        # No spread in either group: significant only if A's mean is higher
+        if se2 == 0:
+            return 0.0 if diff > 0 else 1.0
+
+        t_stat = diff / np.sqrt(se2)
+        # Welch-Satterthwaite degrees of freedom
+        df = se2 ** 2 / (var_a ** 2 / max(stats_a.n - 1, 1) + var_b ** 2 / max(stats_b.n - 1, 1))
+        return float(np.nan_to_num(stats.t.sf(t_stat, df), nan=1.0))
+
+    def _analyze_results(self, test_name, initial_a, final_a, initial_b, final_b,
+                         stats_a, stats_b):
         """
         Analyze test results
 
@@ -173,44 +312,24 @@ class ABTestingSystem:
         - Improvement in Group A
         - Improvement in Group B (should be small)
         - Difference between them
-        - Is the difference statistically significant?
+        - Is the difference statistically significant? (one-sided Welch's
+          t-test that Group A's average improvement, which drives the
+          recommendation, exceeds Group B's; its per-step mean and variance
+          come from the streamed per-metric statistics)
         """
 
-        # Calculate improvement
-        improvement_a = {
-            'throughput': ((final_a['avg_throughput'] - initial_a['avg_throughput']) /
-                          initial_a['avg_throughput'] * 100),
-            'drop_rate': ((initial_a['avg_drop_rate'] - final_a['avg_drop_rate']) /
-                         initial_a['avg_drop_rate'] * 100),
-            'satisfaction': ((final_a['avg_satisfaction'] - initial_a['avg_satisfaction']) /
-                           initial_a['avg_satisfaction'] * 100),
-            'power': ((initial_a['total_power'] - final_a['total_power']) /
-                     initial_a['total_power'] * 100)
-        }
-
-        improvement_b = {
-            'throughput': ((final_b['avg_throughput'] - initial_b['avg_throughput']) /
-                          initial_b['avg_throughput'] * 100),
-            'drop_rate': ((initial_b['avg_drop_rate'] - final_b['avg_drop_rate']) /
-                         initial_b['avg_drop_rate'] * 100),
-            'satisfaction': ((final_b['avg_satisfaction'] - initial_b['avg_satisfaction']) /
-                           initial_b['avg_satisfaction'] * 100),
-            'power': ((initial_b['total_power'] - final_b['total_power']) /
-                     initial_b['total_power'] * 100)
-        }
-
         # Calculate relative improvement
-        relative_improvement = {
-            key: improvement_a[key] - improvement_b[key]
-            for key in improvement_a.keys()
-        }
+        relative = (self._improvement_vector(initial_a, final_a) -
+                    self._improvement_vector(initial_b, final_b))
+        relative_improvement = dict(zip(IMPROVEMENT_KEYS, relative))
 
-        # Test significance (simplified)
-        # In practice, use t-test or z-test
-        avg_relative_improvement = np.mean(list(relative_improvement.values()))
-        is_significant = abs(avg_relative_improvement) > 5  # More than 5% improvement
+        # Test significance
+        p_value = self._welch_p_value(stats_a, stats_b)
+        avg_relative_improvement = relative.mean()
+        is_significant = p_value < self.confidence_threshold
 
-        confidence = min(abs(avg_relative_improvement) / 10 * 100, 99)  # Simulated
+        # Confidence that Group A improves more than Group B
+        confidence = (1 - p_value) * 100
 
         # Recommendation
         if is_significant and avg_relative_improvement > 0:
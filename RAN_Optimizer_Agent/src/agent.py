@@ -75,9 +75,21 @@ class RANOptimizationAgent:
             'avg_q_values': []
         }
 
-    def update_target_network(self):
-        """Update target network weights"""
-        self.target_network.load_state_dict(self.q_network.state_dict())
+    def update_target_network(self, tau=1.0):
+        """
+        Update target network weights in place
+
+        Args:
+            tau: Polyak averaging factor (1.0 = hard copy, small values
+                 such as 0.005 = soft update every step)
+        """
+        with torch.no_grad():
+            for target_param, online_param in zip(self.target_network.parameters(),
+                                                  self.q_network.parameters()):
+                if tau >= 1.0:
+                    target_param.copy_(online_param)
+                else:
+                    target_param.mul_(1.0 - tau).add_(online_param, alpha=tau)
 
     def remember(self, state, action, reward, next_state, done):
         """Store experience in memory"""
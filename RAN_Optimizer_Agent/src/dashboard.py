@@ -5,14 +5,15 @@ Uses Dash and Plotly to create a web interface
 
 import os
 import sys
+import threading
+import traceback
 import numpy as np
-import pandas as pd
-from datetime import datetime
+from collections import deque
 import json
 
 # Dash and Plotly
 import dash
-from dash import dcc, html, Input, Output
+from dash import dcc, html, Input, Output, State, Patch
 import plotly.graph_objs as go
 import plotly.express as px
 
@@ -23,13 +24,22 @@ from ran_environment import RANEnvironment
 from agent import RANOptimizationAgent
 
 
+# Columns of the cell details table
+CELL_TABLE_COLUMNS = ('Cell', 'Users', 'Throughput (Mbps)', 'Drop Rate (%)',
+                      'Power (dBm)', 'Antenna Tilt', 'Satisfaction')
+
+# Seconds of history shown by the live graphs (50 refreshes of 2 seconds)
+HISTORY_SECONDS = 100
+
+
 class RANDashboard:
     """Dashboard for network monitoring"""
 
-    def __init__(self, model_path=None):
+    def __init__(self, model_path=None, sim_interval=0.5):
         """
         Args:
             model_path: Path to trained model (optional)
+            sim_interval: Seconds between background simulation steps
         """
 
         # Create environment and agent
@@ -45,15 +55,26 @@ class RANDashboard:
         else:
             self.is_trained = False
 
-        # Live data
+        # Live data (bounded windows: appending drops the oldest point), sized
+        # so the graphs cover HISTORY_SECONDS of simulation
+        self.max_points = max(1, round(HISTORY_SECONDS / sim_interval))
         self.live_data = {
-            'timestamps': [],
-            'avg_throughput': [],
-            'avg_drop_rate': [],
-            'avg_satisfaction': [],
-            'total_power': []
+            key: deque(maxlen=self.max_points)
+            for key in ('avg_throughput', 'avg_drop_rate', 'avg_satisfaction', 'total_power')
         }
 
+        # The simulation runs in a background thread so callbacks never wait on
+        # a step; the lock guards env, live_data and the latest stats
+        self.sim_interval = sim_interval
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._sample_count = 0
+        self._latest_stats = None
+        self.env.reset()
+        self._sim_step()
+        self._sim_thread = threading.Thread(target=self._sim_loop, daemon=True)
+        self._sim_thread.start()
+
         # Create app
         self.app = dash.Dash(__name__)
         self._setup_layout()
@@ -117,6 +138,10 @@ class RANDashboard:
                 html.Div(id='cells-table')
             ], style={'padding': '20px'}),
 
+            # Samples already sent to this browser tab (0 = no figures yet);
+            # later ticks send Patch updates carrying only the newer samples
+            dcc.Store(id='samples-sent', data=0),
+
             # Auto-refresh
             dcc.Interval(
                 id='interval-component',
@@ -134,16 +159,39 @@ class RANDashboard:
              Output('live-drop-rate-graph', 'figure'),
              Output('satisfaction-gauge', 'figure'),
              Output('power-bar-chart', 'figure'),
-             Output('cells-table', 'children')],
-            [Input('interval-component', 'n_intervals')]
+             Output('cells-table', 'children'),
+             Output('samples-sent', 'data')],
+            [Input('interval-component', 'n_intervals')],
+            [State('samples-sent', 'data')]
         )
-        def update_dashboard(n):
-            """Update dashboard"""
+        def update_dashboard(n, samples_sent):
+            """Update dashboard from the latest simulation snapshot"""
+
+            with self._lock:
+                stats = self._latest_stats
+                sample_count = self._sample_count
+                window = {key: list(values) for key, values in self.live_data.items()}
+                cells = [dict(cell) for cell in self.env.cells[:5]]  # First 5 cells
 
-            # Execute step in environment
-            if n == 0:
-                self.env.reset()
+            # 1. KPI cards
+            kpi_cards = self._create_kpi_cards(stats)
 
+            # 2-5. Charts: full figures on the tab's first render (or when it
+            # fell a whole window behind), then only the new samples
+            new_samples = sample_count - (samples_sent or 0)
+            if n == 0 or not samples_sent or not 0 <= new_samples < self.max_points:
+                figures = self._create_figures(stats, window, cells, sample_count)
+            else:
+                figures = self._patch_figures(stats, window, cells, sample_count, samples_sent)
+
+            # 6. Cell details table
+            cells_table = self._create_cells_table(cells)
+
+            return (kpi_cards, *figures, cells_table, sample_count)
+
+    def _sim_step(self):
+        """Execute one environment step and record its statistics"""
+        with self._lock:
             state = self.env._get_state()
 
             if self.is_trained:
@@ -156,100 +204,140 @@ class RANDashboard:
             # Get statistics
             stats = self.env.get_network_stats()
 
-            # Save live data
-            self.live_data['timestamps'].append(datetime.now())
+            # Save live data (a full window drops its oldest point)
             self.live_data['avg_throughput'].append(stats['avg_throughput'])
             self.live_data['avg_drop_rate'].append(stats['avg_drop_rate'] * 100)
             self.live_data['avg_satisfaction'].append(stats['avg_satisfaction'])
             self.live_data['total_power'].append(stats['total_power'])
+            self._latest_stats = stats
+            self._sample_count += 1
+
+    def _sim_loop(self):
+        """Background simulation at a fixed tick until stop() is called"""
+        while not self._stop_event.wait(self.sim_interval):
+            try:
+                self._sim_step()
+            except Exception:
+                # Keep the dashboard live: report the error and restart the
+                # episode (the failed step may have left the env half-updated)
+                print("Simulation step failed, resetting the environment:")
+                traceback.print_exc()
+                with self._lock:
+                    self.env.reset()
+
+    def stop(self):
+        """Stop the background simulation"""
+        self._stop_event.set()
+        self._sim_thread.join()
+
+    def _create_figures(self, stats, window, cells, sample_count):
+        """Create full chart figures from a live data window snapshot"""
+
+        # Sample numbers of the points in the window
+        x_values = list(range(sample_count - len(window['avg_throughput']), sample_count))
+
+        # Throughput graph
+        throughput_fig = go.Figure()
+        throughput_fig.add_trace(go.Scatter(
+            x=x_values,
+            y=window['avg_throughput'],
+            mode='lines+markers',
+            name='Throughput',
+            line=dict(color='#3498db', width=2)
+        ))
+        throughput_fig.update_layout(
+            title='Average Throughput (Mbps)',
+            xaxis_title='Sample',
+            yaxis_title='Mbps',
+            height=300
+        )
 
-            # Keep only last 50 points
-            for key in self.live_data:
-                if len(self.live_data[key]) > 50:
-                    self.live_data[key] = self.live_data[key][-50:]
-
-            # 1. KPI cards
-            kpi_cards = self._create_kpi_cards(stats)
+        # Drop rate graph
+        drop_rate_fig = go.Figure()
+        drop_rate_fig.add_trace(go.Scatter(
+            x=x_values,
+            y=window['avg_drop_rate'],
+            mode='lines+markers',
+            name='Drop Rate',
+            line=dict(color='#e74c3c', width=2),
+            fill='tozeroy'
+        ))
+        drop_rate_fig.update_layout(
+            title='Average Call Drop Rate (%)',
+            xaxis_title='Sample',
+            yaxis_title='%',
+            height=300
+        )
 
-            # 2. Throughput graph
-            throughput_fig = go.Figure()
-            throughput_fig.add_trace(go.Scatter(
-                x=list(range(len(self.live_data['avg_throughput']))),
-                y=self.live_data['avg_throughput'],
-                mode='lines+markers',
-                name='Throughput',
-                line=dict(color='#3498db', width=2)
-            ))
-            throughput_fig.update_layout(
-                title='Average Throughput (Mbps)',
-                xaxis_title='Time',
-                yaxis_title='Mbps',
-                height=300
+        # Satisfaction gauge
+        satisfaction_fig = go.Figure(go.Indicator(
+            mode="gauge+number+delta",
+            value=stats['avg_satisfaction'],
+            domain={'x': [0, 1], 'y': [0, 1]},
+            title={'text': "User Satisfaction"},
+            delta={'reference': 70},
+            gauge={
+                'axis': {'range': [None, 100]},
+                'bar': {'color': "darkblue"},
+                'steps': [
+                    {'range': [0, 50], 'color': "lightgray"},
+                    {'range': [50, 75], 'color': "yellow"},
+                    {'range': [75, 100], 'color': "lightgreen"}
+                ],
+                'threshold': {
+                    'line': {'color': "red", 'width': 4},
+                    'thickness': 0.75,
+                    'value': 90
+                }
+            }
+        ))
+        satisfaction_fig.update_layout(height=300)
+
+        # Power consumption by cell
+        cell_ids = [f"Cell {c['id']}" for c in cells]
+        power_values = [c['power_consumption'] for c in cells]
+
+        power_fig = go.Figure(data=[
+            go.Bar(
+                x=cell_ids,
+                y=power_values,
+                marker_color='#f39c12'
             )
+        ])
+        power_fig.update_layout(
+            title='Power Consumption (First 5 Cells)',
+            xaxis_title='Cell',
+            yaxis_title='Watts',
+            height=300
+        )
 
-            # 3. Drop rate graph
-            drop_rate_fig = go.Figure()
-            drop_rate_fig.add_trace(go.Scatter(
-                x=list(range(len(self.live_data['avg_drop_rate']))),
-                y=self.live_data['avg_drop_rate'],
-                mode='lines+markers',
-                name='Drop Rate',
-                line=dict(color='#e74c3c', width=2),
-                fill='tozeroy'
-            ))
-            drop_rate_fig.update_layout(
-                title='Average Call Drop Rate (%)',
-                xaxis_title='Time',
-                yaxis_title='%',
-                height=300
-            )
+        return throughput_fig, drop_rate_fig, satisfaction_fig, power_fig
 
-            # 4. Satisfaction gauge
-            satisfaction_fig = go.Figure(go.Indicator(
-                mode="gauge+number+delta",
-                value=stats['avg_satisfaction'],
-                domain={'x': [0, 1], 'y': [0, 1]},
-                title={'text': "User Satisfaction"},
-                delta={'reference': 70},
-                gauge={
-                    'axis': {'range': [None, 100]},
-                    'bar': {'color': "darkblue"},
-                    'steps': [
-                        {'range': [0, 50], 'color': "lightgray"},
-                        {'range': [50, 75], 'color': "yellow"},
-                        {'range': [75, 100], 'color': "lightgreen"}
-                    ],
-                    'threshold': {
-                        'line': {'color': "red", 'width': 4},
-                        'thickness': 0.75,
-                        'value': 90
-                    }
-                }
-            ))
-            satisfaction_fig.update_layout(height=300)
-
-            # 5. Power consumption by cell
-            cell_ids = [f"Cell {c['id']}" for c in self.env.cells[:5]]
-            power_values = [c['power_consumption'] for c in self.env.cells[:5]]
-
-            power_fig = go.Figure(data=[
-                go.Bar(
-                    x=cell_ids,
-                    y=power_values,
-                    marker_color='#f39c12'
-                )
-            ])
-            power_fig.update_layout(
-                title='Power Consumption (First 5 Cells)',
-                xaxis_title='Cell',
-                yaxis_title='Watts',
-                height=300
-            )
+    def _patch_figures(self, stats, window, cells, sample_count, samples_sent):
+        """Partial figure updates carrying only the samples a tab hasn't received"""
 
-            # 6. Cell details table
-            cells_table = self._create_cells_table()
+        new_samples = sample_count - samples_sent
+        # The browser shows the last min(samples_sent, max_points) points
+        num_dropped = max(0, min(samples_sent, self.max_points) + new_samples - self.max_points)
+
+        line_patches = []
+        for key in ('avg_throughput', 'avg_drop_rate'):
+            patch = Patch()
+            for _ in range(num_dropped):
+                del patch['data'][0]['x'][0]
+                del patch['data'][0]['y'][0]
+            if new_samples:
+                patch['data'][0]['x'].extend(list(range(samples_sent, sample_count)))
+                patch['data'][0]['y'].extend(window[key][-new_samples:])
+            line_patches.append(patch)
 
-            return kpi_cards, throughput_fig, drop_rate_fig, satisfaction_fig, power_fig, cells_table
+        satisfaction_patch = Patch()
+        satisfaction_patch['data'][0]['value'] = stats['avg_satisfaction']
+
+        power_patch = Patch()
+        power_patch['data'][0]['y'] = [c['power_consumption'] for c in cells]
+
+        return (*line_patches, satisfaction_patch, power_patch)
 
     def _create_kpi_cards(self, stats):
         """Create KPI cards"""
@@ -322,12 +410,12 @@ class RANDashboard:
 
         return cards
 
-    def _create_cells_table(self):
+    def _create_cells_table(self, cells):
         """Create table with cell details"""
 
         # Table data
         data = []
-        for cell in self.env.cells[:5]:  # First 5 cells
+        for cell in cells:
             satisfaction = self.env._calculate_satisfaction(cell)
             data.append({
                 'Cell': f"Cell {cell['id']}",
@@ -339,18 +427,15 @@ class RANDashboard:
                 'Satisfaction': f"{satisfaction:.0f}/100"
             })
 
-        # Convert to DataFrame
-        df = pd.DataFrame(data)
-
         # Create HTML table
         table = html.Table([
             html.Thead(
-                html.Tr([html.Th(col) for col in df.columns])
+                html.Tr([html.Th(col) for col in CELL_TABLE_COLUMNS])
             ),
             html.Tbody([
                 html.Tr([
-                    html.Td(df.iloc[i][col]) for col in df.columns
-                ]) for i in range(len(df))
+                    html.Td(row[col]) for col in CELL_TABLE_COLUMNS
+                ]) for row in data
             ])
         ], style={
             'width': '100%',
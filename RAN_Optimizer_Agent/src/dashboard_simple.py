@@ -4,6 +4,10 @@ Simplified dashboard with better Windows compatibility
 
 import os
 import sys
+import time
+import threading
+from collections import deque
+from functools import lru_cache
 import numpy as np
 import pandas as pd
 from datetime import datetime
@@ -14,8 +18,9 @@ from ran_environment import RANEnvironment
 from agent import RANOptimizationAgent
 
 import dash
-from dash import dcc, html, Input, Output
+from dash import dcc, html, Input, Output, State
 import plotly.graph_objs as go
+from plotly.subplots import make_subplots
 
 
 # Create environment and agent
@@ -43,14 +48,124 @@ else:
     is_trained = False
     print("No trained model found - using random actions")
 
-# Live data storage
-live_data = {
-    'timestamps': [],
-    'throughput': [],
-    'drop_rate': [],
-    'satisfaction': [],
-    'power': []
-}
+# Points kept per graph; the browser keeps this window, each tick only
+# sends the samples it has not seen yet (extendData)
+MAX_POINTS = 50
+
+# Seconds between simulation steps of the background producer
+SIM_INTERVAL = 0.5
+
+# Refresh period of the dashboard while the tab is visible / hidden (ms)
+VISIBLE_INTERVAL_MS = 2000
+HIDDEN_INTERVAL_MS = 30000
+
+# Without a poll from a visible tab for this long nobody is watching: the
+# producer then only steps once per hidden-tab refresh period
+IDLE_AFTER = 3 * VISIBLE_INTERVAL_MS / 1000
+_last_visible_poll = float('-inf')
+
+# Latest (step, stats) samples, written by the simulation thread
+_buf = deque(maxlen=MAX_POINTS)
+_buf_lock = threading.Lock()
+
+# Producer thread, started by start_simulation() rather than on import
+_sim_thread = None
+
+
+def _sim_loop():
+    """Step environment and agent off the callback thread, at a fixed tick"""
+    env.reset()
+    step = 0
+    last_step_time = float('-inf')
+    while True:
+        now = time.monotonic()
+        idle = now - _last_visible_poll > IDLE_AFTER
+        if idle and now - last_step_time < HIDDEN_INTERVAL_MS / 1000:
+            time.sleep(SIM_INTERVAL)
+            continue
+        last_step_time = now
+
+        state = env._get_state()
+        if is_trained:
+            action = agent.act(state, training=False)
+        else:
+            action = env.action_space.sample()
+
+        env.step(action)
+        stats = env.get_network_stats()
+
+        with _buf_lock:
+            _buf.append((step, stats))
+        step += 1
+        time.sleep(SIM_INTERVAL)
+
+
+# Live series shown in the combined graph, one subplot each (row-major):
+# (subplot title, y-axis title, trace name, color, fill)
+LIVE_SERIES = (
+    ('Average Throughput (Mbps)', 'Mbps', 'Throughput', '#3498db', None),
+    ('Call Drop Rate (%)', '%', 'Drop Rate', '#e74c3c', 'tozeroy'),
+    ('User Satisfaction', 'Score (0-100)', 'Satisfaction', '#2ecc71', None),
+    ('Total Power Consumption', 'Watts', 'Power', '#f39c12', None),
+)
+
+
+def create_live_figure():
+    """
+    Empty 2x2 time-series figure that is filled by extendData updates
+    One graph component for the four series, so the browser reconciles a
+    single chart per tick
+    """
+    fig = make_subplots(rows=2, cols=2, subplot_titles=[series[0] for series in LIVE_SERIES])
+    for i, (_, yaxis_title, name, color, fill) in enumerate(LIVE_SERIES):
+        row, col = i // 2 + 1, i % 2 + 1
+        fig.add_trace(go.Scatter(
+            x=[],
+            y=[],
+            mode='lines+markers',
+            name=name,
+            line=dict(color=color, width=2),
+            fill=fill
+        ), row=row, col=col)
+        fig.update_xaxes(title_text='Time Step', row=row, col=col)
+        fig.update_yaxes(title_text=yaxis_title, row=row, col=col)
+    fig.update_layout(height=600, showlegend=False)
+    return fig
+
+
+@lru_cache(maxsize=256)
+def build_kpi_cards(throughput, drop_rate, satisfaction, power):
+    """
+    KPI cards for the formatted values
+    Cached on the displayed strings: the rounded numbers rarely change
+    between ticks, so the component tree is usually reused
+    """
+    return html.Div([
+        html.Div([
+            html.H2(throughput, style={'color': '#3498db'}),
+            html.P("Average Throughput")
+        ], style={'display': 'inline-block', 'margin': '20px', 'padding': '20px',
+                 'backgroundColor': 'white', 'borderRadius': '10px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
+
+        html.Div([
+            html.H2(drop_rate, style={'color': '#e74c3c'}),
+            html.P("Drop Rate")
+        ], style={'display': 'inline-block', 'margin': '20px', 'padding': '20px',
+                 'backgroundColor': 'white', 'borderRadius': '10px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
+
+        html.Div([
+            html.H2(satisfaction, style={'color': '#2ecc71'}),
+            html.P("User Satisfaction")
+        ], style={'display': 'inline-block', 'margin': '20px', 'padding': '20px',
+                 'backgroundColor': 'white', 'borderRadius': '10px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
+
+        html.Div([
+            html.H2(power, style={'color': '#f39c12'}),
+            html.P("Total Power")
+        ], style={'display': 'inline-block', 'margin': '20px', 'padding': '20px',
+                 'backgroundColor': 'white', 'borderRadius': '10px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
+    ])
+
 
 # Create Dash app
 app = dash.Dash(__name__)
@@ -69,153 +184,115 @@ app.layout = html.Div([
     html.Div(id='kpi-cards', style={'textAlign': 'center', 'padding': '20px'}),
 
     # Graphs
-    html.Div([
-        html.Div([dcc.Graph(id='throughput-graph')], style={'width': '50%', 'display': 'inline-block'}),
-        html.Div([dcc.Graph(id='drop-rate-graph')], style={'width': '50%', 'display': 'inline-block'}),
-    ]),
+    dcc.Graph(id='combined-graph', figure=create_live_figure()),
 
-    html.Div([
-        html.Div([dcc.Graph(id='satisfaction-graph')], style={'width': '50%', 'display': 'inline-block'}),
-        html.Div([dcc.Graph(id='power-graph')], style={'width': '50%', 'display': 'inline-block'}),
-    ]),
+    # Last simulation step shown by this browser tab, and the samples of the
+    # latest tick as columns [steps, throughput, drop rate, satisfaction, power]
+    dcc.Store(id='last-step', data=-1),
+    dcc.Store(id='sample-store', data=None),
 
-    # Auto-refresh every 2 seconds
-    dcc.Interval(id='interval', interval=2000, n_intervals=0)
+    # Auto-refresh every 2 seconds (every 30 while the tab is hidden)
+    dcc.Interval(id='interval', interval=VISIBLE_INTERVAL_MS, n_intervals=0)
 ])
 
 
-@app.callback(
-    [Output('kpi-cards', 'children'),
-     Output('throughput-graph', 'figure'),
-     Output('drop-rate-graph', 'figure'),
-     Output('satisfaction-graph', 'figure'),
-     Output('power-graph', 'figure')],
-    [Input('interval', 'n_intervals')]
+# Slow the refresh down while the tab is hidden, in the browser: the first tick
+# installs a visibilitychange listener that swaps the interval immediately
+app.clientside_callback(
+    """
+    function(n, interval) {
+        if (!window._ranVisibilityListener) {
+            window._ranVisibilityListener = true;
+            document.addEventListener('visibilitychange', function() {
+                window.dash_clientside.set_props('interval', {
+                    interval: document.hidden ? %(hidden)d : %(visible)d
+                });
+            });
+        }
+        var wanted = document.hidden ? %(hidden)d : %(visible)d;
+        return wanted === interval ? window.dash_clientside.no_update : wanted;
+    }
+    """ % {'hidden': HIDDEN_INTERVAL_MS, 'visible': VISIBLE_INTERVAL_MS},
+    Output('interval', 'interval'),
+    Input('interval', 'n_intervals'),
+    State('interval', 'interval')
 )
-def update_dashboard(n):
-    global live_data
 
-    # Reset environment on first call
-    if n == 0:
-        env.reset()
-
-    # Get state and take action
-    state = env._get_state()
-    if is_trained:
-        action = agent.act(state, training=False)
-    else:
-        action = env.action_space.sample()
 
-    env.step(action)
-
-    # Get statistics
-    stats = env.get_network_stats()
+# Append each tick's samples to the four traces in the browser: the server only
+# ships the sample columns, the shared x values are expanded here
+app.clientside_callback(
+    """
+    function(samples) {
+        if (!samples) {
+            return window.dash_clientside.no_update;
+        }
+        var steps = samples[0];
+        return [{x: [steps, steps, steps, steps], y: samples.slice(1)}, [0, 1, 2, 3], %d];
+    }
+    """ % MAX_POINTS,
+    Output('combined-graph', 'extendData'),
+    Input('sample-store', 'data')
+)
 
-    # Store data
-    live_data['timestamps'].append(n)
-    live_data['throughput'].append(stats['avg_throughput'])
-    live_data['drop_rate'].append(stats['avg_drop_rate'] * 100)
-    live_data['satisfaction'].append(stats['avg_satisfaction'])
-    live_data['power'].append(stats['total_power'])
 
-    # Keep only last 50 points
-    if len(live_data['timestamps']) > 50:
-        for key in live_data:
-            live_data[key] = live_data[key][-50:]
+@app.callback(
+    [Output('kpi-cards', 'children'),
+     Output('sample-store', 'data'),
+     Output('last-step', 'data')],
+    [Input('interval', 'n_intervals')],
+    [State('last-step', 'data'),
+     State('interval', 'interval')]
+)
+def update_dashboard(n, last_step, interval):
+    # Keep the producer running at full rate only while a visible tab polls
+    global _last_visible_poll
+    if interval == VISIBLE_INTERVAL_MS:
+        _last_visible_poll = time.monotonic()
+
+    # Read the samples produced by the simulation thread: walk the deque from
+    # the newest end and stop at the first one this tab has already shown
+    with _buf_lock:
+        if not _buf:
+            raise dash.exceptions.PreventUpdate
+        latest_step, stats = _buf[-1]
+        new_samples = []
+        for step, sample in reversed(_buf):
+            if step <= last_step:
+                break
+            new_samples.append((step, sample))
+    new_samples.reverse()
 
     # KPI Cards
-    kpi_cards = html.Div([
-        html.Div([
-            html.H2(f"{stats['avg_throughput']:.1f} Mbps", style={'color': '#3498db'}),
-            html.P("Average Throughput")
-        ], style={'display': 'inline-block', 'margin': '20px', 'padding': '20px',
-                 'backgroundColor': 'white', 'borderRadius': '10px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
-
-        html.Div([
-            html.H2(f"{stats['avg_drop_rate']*100:.2f}%", style={'color': '#e74c3c'}),
-            html.P("Drop Rate")
-        ], style={'display': 'inline-block', 'margin': '20px', 'padding': '20px',
-                 'backgroundColor': 'white', 'borderRadius': '10px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
-
-        html.Div([
-            html.H2(f"{stats['avg_satisfaction']:.1f}/100", style={'color': '#2ecc71'}),
-            html.P("User Satisfaction")
-        ], style={'display': 'inline-block', 'margin': '20px', 'padding': '20px',
-                 'backgroundColor': 'white', 'borderRadius': '10px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
-
-        html.Div([
-            html.H2(f"{stats['total_power']:.0f}W", style={'color': '#f39c12'}),
-            html.P("Total Power")
-        ], style={'display': 'inline-block', 'margin': '20px', 'padding': '20px',
-                 'backgroundColor': 'white', 'borderRadius': '10px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
-    ])
-
-    # Throughput graph
-    throughput_fig = go.Figure()
-    throughput_fig.add_trace(go.Scatter(
-        x=live_data['timestamps'],
-        y=live_data['throughput'],
-        mode='lines+markers',
-        name='Throughput',
-        line=dict(color='#3498db', width=2)
-    ))
-    throughput_fig.update_layout(
-        title='Average Throughput (Mbps)',
-        xaxis_title='Time Step',
-        yaxis_title='Mbps',
-        height=300
+    kpi_cards = build_kpi_cards(
+        f"{stats['avg_throughput']:.1f} Mbps",
+        f"{stats['avg_drop_rate']*100:.2f}%",
+        f"{stats['avg_satisfaction']:.1f}/100",
+        f"{stats['total_power']:.0f}W"
     )
 
-    # Drop rate graph
-    drop_fig = go.Figure()
-    drop_fig.add_trace(go.Scatter(
-        x=live_data['timestamps'],
-        y=live_data['drop_rate'],
-        mode='lines+markers',
-        name='Drop Rate',
-        line=dict(color='#e74c3c', width=2),
-        fill='tozeroy'
-    ))
-    drop_fig.update_layout(
-        title='Call Drop Rate (%)',
-        xaxis_title='Time Step',
-        yaxis_title='%',
-        height=300
-    )
+    # Graphs: send the samples since the last tick, the clientside callback
+    # appends them and the browser keeps the last MAX_POINTS of each trace
+    if new_samples:
+        samples = [
+            [step for step, _ in new_samples],
+            [sample['avg_throughput'] for _, sample in new_samples],
+            [sample['avg_drop_rate'] * 100 for _, sample in new_samples],
+            [sample['avg_satisfaction'] for _, sample in new_samples],
+            [sample['total_power'] for _, sample in new_samples]
+        ]
+    else:
+        samples = dash.no_update
 
-    # Satisfaction graph
-    sat_fig = go.Figure()
-    sat_fig.add_trace(go.Scatter(
-        x=live_data['timestamps'],
-        y=live_data['satisfaction'],
-        mode='lines+markers',
-        name='Satisfaction',
-        line=dict(color='#2ecc71', width=2)
-    ))
-    sat_fig.update_layout(
-        title='User Satisfaction',
-        xaxis_title='Time Step',
-        yaxis_title='Score (0-100)',
-        height=300
-    )
+    return kpi_cards, samples, latest_step
 
-    # Power graph
-    power_fig = go.Figure()
-    power_fig.add_trace(go.Scatter(
-        x=live_data['timestamps'],
-        y=live_data['power'],
-        mode='lines+markers',
-        name='Power',
-        line=dict(color='#f39c12', width=2)
-    ))
-    power_fig.update_layout(
-        title='Total Power Consumption',
-        xaxis_title='Time Step',
-        yaxis_title='Watts',
-        height=300
-    )
 
-    return kpi_cards, throughput_fig, drop_fig, sat_fig, power_fig
+def start_simulation():
+    """Start the background simulation producer (once)"""
+    global _sim_thread
+    if _sim_thread is None:
+        _sim_thread = threading.Thread(target=_sim_loop, daemon=True)
+        _sim_thread.start()
 
 
 if __name__ == '__main__':
@@ -229,6 +306,8 @@ if __name__ == '__main__':
     print("\nPress Ctrl+C to stop")
     print("="*60 + "\n")
 
+    start_simulation()
+
     # Run with settings optimized for Windows
     app.run(
         debug=False,
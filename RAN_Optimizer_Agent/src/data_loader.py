@@ -4,10 +4,22 @@ Loads and preprocesses real network data from CSV file
 """
 
 import os
+import glob
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 
+try:
+    import pyarrow  # Multi-threaded CSV reader and the Parquet data cache
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Errors of a missing, partial or corrupt cache file, or of writing one
+CACHE_ERRORS = (OSError, ValueError, KeyError)
+if PYARROW_AVAILABLE:
+    CACHE_ERRORS += (pyarrow.ArrowException,)
+
 
 class NetworkDataLoader:
     """
@@ -42,12 +54,62 @@ class NetworkDataLoader:
         'optimized_action': 'Optimized_Action'
     }
 
-    def __init__(self, data_path: Optional[str] = None):
+    # CSV schema: explicit types skip per-column inference. They are the types
+    # inference would pick, so the public frames keep their int64/object columns;
+    # categorical codes are only derived internally (see _aggregate_by_cell).
+    COLUMN_DTYPES = {
+        'Cell_ID': 'int64',
+        'User_ID': 'int64',
+        'Channel_ID': 'int64',
+        'Cell_Type': 'object',
+        'Carrier_Frequency_GHz': 'float64',
+        'Bandwidth_MHz': 'int64',
+        'Modulation_Scheme': 'object',
+        'Transmission_Power_dBm': 'float64',
+        'Interference_Level_dB': 'float64',
+        'Power_Consumption_Watt': 'float64',
+        'Achieved_Throughput_Mbps': 'float64',
+        'Energy_Efficiency_Mbps_Watt': 'float64',
+        'Network_Latency_ms': 'float64',
+        'Packet_Loss_Ratio': 'float64',
+        'Signal_to_Noise_Ratio_dB': 'float64',
+        'Resource_Utilization': 'float64',
+        'User_Traffic_Demand_Mbps': 'float64',
+        'QoS_Satisfaction': 'float64',
+        'User_Mobility_kmh': 'float64',
+        'Handover_Count': 'int64',
+        'Optimized_Power_dBm': 'float64',
+        'Reward_Score': 'float64',
+        'Success_Rate': 'float64',
+        'Optimized_Action': 'object'
+    }
+
+    # Packed per-cell record (one row per cell, get_cell_ids() order) behind the
+    # metric dicts: float32 measurements, int32 ids and user counts; the string
+    # fields ('U') are sized to the longest value in the data
+    CELL_ARRAY_FIELDS = (
+        ('id', 'i4'), ('cell_type', 'U'), ('tx_power', 'f4'), ('antenna_tilt', 'f4'),
+        ('handover_threshold', 'f4'), ('num_users', 'i4'), ('throughput', 'f4'),
+        ('drop_rate', 'f4'), ('power_consumption', 'f4'), ('interference', 'f4'),
+        ('latency', 'f4'), ('snr', 'f4'), ('resource_utilization', 'f4'),
+        ('qos_satisfaction', 'f4'), ('frequency', 'f4'), ('bandwidth', 'f4'),
+        ('optimized_power', 'f4'), ('optimized_action', 'U')
+    )
+
+    # Bump when the cached structures change shape
+    CACHE_VERSION = 6
+
+    # Cell data column holding the dominant action (categorical) in the cache
+    CACHE_ACTION_COLUMN = '_dominant_action'
+
+    def __init__(self, data_path: Optional[str] = None, use_cache: bool = True):
         """
         Initialize the data loader.
 
         Args:
             data_path: Path to the CSV file. If None, uses default location.
+            use_cache: Reuse/write the parsed data cache stored next to the CSV
+                (Parquet files, so only used when pyarrow is installed).
         """
         if data_path is None:
             # Default path relative to this file
@@ -55,9 +117,17 @@ class NetworkDataLoader:
             data_path = os.path.join(base_dir, 'data', '6G_HetNet_Transmission_Management.csv')
 
         self.data_path = data_path
+        self.use_cache = use_cache and PYARROW_AVAILABLE
         self.raw_data = None
         self.processed_data = None
         self.cell_data = None
+        self._cell_arr = np.empty(0, dtype=[(name, 'f4') for name, _ in self.CELL_ARRAY_FIELDS])
+        self._records: List[Dict] = []
+        self._record_position: Dict[int, int] = {}
+        self._by_type: Dict[str, List[Dict]] = {}
+        self._rows_by_cell: Dict[int, np.ndarray] = {}
+        self._action_categories = np.empty(0, dtype=object)
+        self._dominant_action_codes = np.empty(0, dtype=np.int8)
         self._load_data()
 
     def _load_data(self):
@@ -65,23 +135,93 @@ class NetworkDataLoader:
         if not os.path.exists(self.data_path):
             raise FileNotFoundError(f"Data file not found: {self.data_path}")
 
+        # Parsed and aggregated data from an earlier process, if the CSV is unchanged
+        raw_path, cells_path = self._cache_paths()
+        if self.use_cache and self._load_cache(raw_path, cells_path):
+            return
+
         # Load CSV
-        self.raw_data = pd.read_csv(self.data_path)
+        self.raw_data = pd.read_csv(
+            self.data_path,
+            engine='pyarrow' if PYARROW_AVAILABLE else 'c',
+            dtype=self.COLUMN_DTYPES
+        )
+        self._preprocess()
+
+        # Group data by cell for easier access
+        self._aggregate_by_cell()
 
-        # Basic preprocessing
-        self.processed_data = self.raw_data.copy()
+        if self.use_cache:
+            self._save_cache(raw_path, cells_path)
 
+    def _preprocess(self):
+        """Derive processed_data (raw data plus the normalized columns) from raw_data."""
         # Normalize interference (convert from negative dB to positive scale)
         # Interference in CSV is negative (e.g., -98 dB), we need 0-1 scale
-        self.processed_data['interference_normalized'] = (
-            (self.processed_data['Interference_Level_dB'] + 100) / 50
-        ).clip(0, 1)
+        interference = np.clip((self.raw_data['Interference_Level_dB'].to_numpy() + 100) / 50, 0, 1)
 
         # Normalize packet loss to 0-1 scale (already in ratio)
-        self.processed_data['drop_rate_normalized'] = self.processed_data['Packet_Loss_Ratio'].clip(0, 0.15)
+        drop_rate = np.clip(self.raw_data['Packet_Loss_Ratio'].to_numpy(), 0, 0.15)
 
-        # Group data by cell for easier access
-        self._aggregate_by_cell()
+        # Basic preprocessing: a shallow copy shares the raw column buffers,
+        # only the two derived columns are new
+        self.processed_data = self.raw_data.copy(deep=False)
+        self.processed_data['interference_normalized'] = interference
+        self.processed_data['drop_rate_normalized'] = drop_rate
+
+    def _cache_paths(self) -> Tuple[str, str]:
+        """
+        Cache files next to the CSV (raw user data, aggregated cell data), keyed
+        by its modification time and size.
+        """
+        stat = os.stat(self.data_path)
+        prefix = f"{self.data_path}.cache.v{self.CACHE_VERSION}.{stat.st_mtime_ns}.{stat.st_size}"
+        return f"{prefix}.raw.parquet", f"{prefix}.cells.parquet"
+
+    def _load_cache(self, raw_path: str, cells_path: str) -> bool:
+        """
+        Restore parsed data from the cache files. Returns False on a miss.
+        Parquet holds only data, so reading a file someone else wrote into the
+        data directory can't run code.
+        """
+        try:
+            raw_data = pd.read_parquet(raw_path)
+            cell_data = pd.read_parquet(cells_path)
+            actions = cell_data.pop(self.CACHE_ACTION_COLUMN)
+        except CACHE_ERRORS:
+            # Missing, partial or unreadable cache: parse the CSV instead
+            return False
+
+        self.raw_data = raw_data
+        self.cell_data = cell_data
+        self._action_categories = np.asarray(actions.cat.categories, dtype=object)
+        self._dominant_action_codes = actions.cat.codes.to_numpy().astype(np.int8)
+        self._preprocess()
+        self._build_records()
+        return True
+
+    def _save_cache(self, raw_path: str, cells_path: str):
+        """Write parsed data to the cache files, replacing caches of older CSV versions."""
+        actions = pd.Categorical.from_codes(self._dominant_action_codes, self._action_categories)
+        frames = (
+            (raw_path, self.raw_data),
+            (cells_path, self.cell_data.assign(**{self.CACHE_ACTION_COLUMN: actions})),
+        )
+        try:
+            for stale_path in glob.glob(glob.escape(self.data_path) + '.cache.*'):
+                os.remove(stale_path)
+
+            # Write then rename, so concurrent readers never see a partial file
+            for path, frame in frames:
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                try:
+                    frame.to_parquet(tmp_path, index=False)
+                    os.replace(tmp_path, path)
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+        except CACHE_ERRORS:
+            pass  # E.g. a read-only data directory: just parse the CSV every time
 
     def _aggregate_by_cell(self):
         """Aggregate user-level data to cell-level metrics."""
@@ -113,6 +253,70 @@ class NetworkDataLoader:
 
         self.cell_data = self.cell_data.reset_index()
 
+        # Lookup structures built once, so per-cell queries avoid full-table scans
+        # Dominant action per cell on the categorical codes: count (cell, action
+        # code) pairs with one bincount and take the argmax per cell (ties -> first
+        # category, like mode()); names are only resolved when returned
+        actions = self.processed_data['Optimized_Action'].astype('category')
+        codes = actions.cat.codes.to_numpy()
+        cell_positions = np.searchsorted(
+            self.cell_data['Cell_ID'].to_numpy(), self.processed_data['Cell_ID'].to_numpy()
+        )
+        valid = codes >= 0  # Skip missing actions, as mode() does
+        num_cells, num_actions = len(self.cell_data), len(actions.cat.categories)
+        counts = np.bincount(
+            cell_positions[valid] * num_actions + codes[valid],
+            minlength=num_cells * num_actions
+        ).reshape(num_cells, num_actions)
+        self._action_categories = np.asarray(actions.cat.categories, dtype=object)
+        self._dominant_action_codes = counts.argmax(axis=1).astype(np.int8)
+        self._build_records()
+
+    def _build_records(self):
+        """Pack the aggregated cell data into the cell array in one columnar pass."""
+        data = self.cell_data
+        columns = {
+            'id': data['Cell_ID'].to_numpy(),
+            'cell_type': data['Cell_Type'].to_numpy().astype(str),
+            'tx_power': data['Transmission_Power_dBm'].to_numpy(),
+            'antenna_tilt': 3.0,  # Not in dataset, use default
+            'handover_threshold': 70.0,  # Not in dataset, use default
+            'num_users': data['num_users'].to_numpy(),
+            'throughput': data['Achieved_Throughput_Mbps'].to_numpy(),
+            'drop_rate': data['Packet_Loss_Ratio'].to_numpy(),
+            'power_consumption': data['Power_Consumption_Watt'].to_numpy(),
+            'interference': data['interference_normalized'].to_numpy(),
+            'latency': data['Network_Latency_ms'].to_numpy(),
+            'snr': data['Signal_to_Noise_Ratio_dB'].to_numpy(),
+            'resource_utilization': data['Resource_Utilization'].to_numpy(),
+            'qos_satisfaction': data['QoS_Satisfaction'].to_numpy(),
+            'frequency': data['Carrier_Frequency_GHz'].to_numpy(),
+            'bandwidth': data['Bandwidth_MHz'].to_numpy(),
+            'optimized_power': data['Optimized_Power_dBm'].to_numpy(),
+            'optimized_action': self._action_categories[self._dominant_action_codes].astype(str)
+        }
+
+        dtype = np.dtype([
+            (name, columns[name].dtype if kind == 'U' else kind)
+            for name, kind in self.CELL_ARRAY_FIELDS
+        ])
+        self._cell_arr = np.empty(len(data), dtype=dtype)
+        for name in dtype.names:
+            self._cell_arr[name] = columns[name]
+        self._cell_arr.flags.writeable = False
+
+        # Dicts for the bulk getters, with the same (float32-rounded) values
+        self._records = [dict(zip(dtype.names, row)) for row in self._cell_arr.tolist()]
+        self._index_records()
+
+    def _index_records(self):
+        """Build the per-cell lookups (records by id and by type, user rows by cell)."""
+        self._rows_by_cell = self.processed_data.groupby('Cell_ID').indices
+        self._record_position = {record['id']: i for i, record in enumerate(self._records)}
+        self._by_type = {}
+        for record in self._records:
+            self._by_type.setdefault(record['cell_type'], []).append(record)
+
     def get_num_cells(self) -> int:
         """Get the number of unique cells in the dataset."""
         return len(self.cell_data)
@@ -129,45 +333,26 @@ class NetworkDataLoader:
             cell_id: The cell ID to retrieve metrics for
 
         Returns:
-            Dictionary of cell metrics
+            Dictionary of cell metrics (measurements are the float32 values
+            of the packed cell array, as Python floats)
         """
-        cell_row = self.cell_data[self.cell_data['Cell_ID'] == cell_id]
-        if cell_row.empty:
+        position = self._record_position.get(cell_id)
+        if position is None:
             raise ValueError(f"Cell ID {cell_id} not found in data")
 
-        row = cell_row.iloc[0]
-
-        return {
-            'id': int(row['Cell_ID']),
-            'cell_type': row['Cell_Type'],
-            'tx_power': float(row['Transmission_Power_dBm']),
-            'antenna_tilt': 3.0,  # Not in dataset, use default
-            'handover_threshold': 70.0,  # Not in dataset, use default
-            'num_users': int(row['num_users']),
-            'throughput': float(row['Achieved_Throughput_Mbps']),
-            'drop_rate': float(row['Packet_Loss_Ratio']),
-            'power_consumption': float(row['Power_Consumption_Watt']),
-            'interference': float(row['interference_normalized']),
-            'latency': float(row['Network_Latency_ms']),
-            'snr': float(row['Signal_to_Noise_Ratio_dB']),
-            'resource_utilization': float(row['Resource_Utilization']),
-            'qos_satisfaction': float(row['QoS_Satisfaction']),
-            'frequency': float(row['Carrier_Frequency_GHz']),
-            'bandwidth': float(row['Bandwidth_MHz']),
-            'optimized_power': float(row['Optimized_Power_dBm']),
-            'optimized_action': self._get_dominant_action(int(row['Cell_ID']))
-        }
+        # One struct load; a fresh dict, callers may modify it
+        return dict(zip(self._cell_arr.dtype.names, self._cell_arr[position].item()))
 
     def _get_dominant_action(self, cell_id: int) -> str:
         """Get the most common optimized action for a cell."""
-        cell_users = self.processed_data[self.processed_data['Cell_ID'] == cell_id]
-        if cell_users.empty:
+        position = self._record_position.get(cell_id)
+        if position is None:
             return 'Maintain_Power'
-        return cell_users['Optimized_Action'].mode().iloc[0]
+        return self._action_categories[self._dominant_action_codes[position]]
 
     def get_all_cells(self) -> List[Dict]:
         """Get metrics for all cells."""
-        return [self.get_cell_metrics(cid) for cid in self.get_cell_ids()]
+        return [dict(record) for record in self._records]
 
     def get_random_cells(self, num_cells: int, seed: Optional[int] = None) -> List[Dict]:
         """
@@ -175,19 +360,18 @@ class NetworkDataLoader:
 
         Args:
             num_cells: Number of cells to select
-            seed: Random seed for reproducibility
+            seed: Random seed for reproducibility (local generator, the global
+                NumPy random state is left untouched)
 
         Returns:
             List of cell metric dictionaries
         """
-        if seed is not None:
-            np.random.seed(seed)
+        rng = np.random.default_rng(seed)
 
-        available_cells = self.get_cell_ids()
-        num_cells = min(num_cells, len(available_cells))
-        selected_ids = np.random.choice(available_cells, size=num_cells, replace=False)
+        num_cells = min(num_cells, len(self._records))
+        selected = rng.choice(len(self._records), size=num_cells, replace=False)
 
-        return [self.get_cell_metrics(cid) for cid in selected_ids]
+        return [dict(self._records[i]) for i in selected]
 
     def get_cells_by_type(self, cell_type: str) -> List[Dict]:
         """
@@ -199,8 +383,7 @@ class NetworkDataLoader:
         Returns:
             List of cell metric dictionaries
         """
-        type_cells = self.cell_data[self.cell_data['Cell_Type'] == cell_type]
-        return [self.get_cell_metrics(cid) for cid in type_cells['Cell_ID']]
+        return [dict(record) for record in self._by_type.get(cell_type, [])]
 
     def get_user_data_for_cell(self, cell_id: int) -> pd.DataFrame:
         """
@@ -212,7 +395,8 @@ class NetworkDataLoader:
         Returns:
             DataFrame with user-level data
         """
-        return self.processed_data[self.processed_data['Cell_ID'] == cell_id].copy()
+        rows = self._rows_by_cell.get(cell_id, np.empty(0, dtype=np.intp))
+        return self.processed_data.iloc[rows].copy()
 
     def sample_network_state(self, num_cells: int = 10, seed: Optional[int] = None) -> List[Dict]:
         """
@@ -263,11 +447,18 @@ class NetworkDataLoader:
         Returns:
             List of episode configurations (each is a list of cell dicts)
         """
-        episodes = []
-        for i in range(num_episodes):
-            cells = self.sample_network_state(num_cells, seed=i)
-            episodes.append(cells)
-        return episodes
+        # Draw every episode's cell selection at once: one shuffled row of record
+        # positions per episode, truncated to num_cells
+        rng = np.random.default_rng(0)
+        num_records = len(self._records)
+        num_cells = min(num_cells, num_records)
+        positions = rng.permuted(np.tile(np.arange(num_records), (num_episodes, 1)), axis=1)[:, :num_cells]
+
+        # Sequential IDs for the environment (copies, the records stay untouched)
+        return [
+            [self._records[j] | {'id': i} for i, j in enumerate(row)]
+            for row in positions.tolist()
+        ]
 
 
 if __name__ == "__main__":
@@ -3,8 +3,166 @@ Fault Detection Module
 Uses anomaly detection to identify network faults
 """
 
+import sys
+from collections import Counter, deque
+from dataclasses import dataclass, fields
+from enum import IntEnum
+from operator import itemgetter
+from types import MappingProxyType
+
 import numpy as np
-from collections import deque
+
+# Severity levels in increasing order, and the deviation (% of the violated
+# bound) that must be exceeded to reach each level after the first
+SEVERITY_LEVELS = ('low', 'medium', 'high', 'critical')
+SEVERITY_BOUNDS = np.array([15.0, 30.0, 50.0])
+
+
+class Severity(IntEnum):
+    """Fault severity as an ordered integer (index into SEVERITY_LEVELS)"""
+    LOW = 0
+    MEDIUM = 1
+    HIGH = 2
+    CRITICAL = 3
+
+
+# Alarm severities (X.733 style) on the same scale
+ALARM_SEVERITY_LEVELS = {
+    'WARNING': Severity.LOW,
+    'MINOR': Severity.MEDIUM,
+    'MAJOR': Severity.HIGH,
+    'CRITICAL': Severity.CRITICAL
+}
+
+# Cell metrics attached to every fault to help diagnose it
+RELEVANT_METRIC_KEYS = (
+    'throughput', 'latency', 'packet_loss', 'cpu_usage', 'memory_usage',
+    'num_users', 'drop_rate', 'interference', 'sinr'
+)
+
+@dataclass(slots=True, frozen=True)
+class Fault:
+    """
+    Detected fault
+    Fields are also readable dict-style (fault['cell_id']) for existing callers;
+    anomaly_details is only set (and only 'in' the fault) for anomaly faults.
+    message is always a str; anomaly faults keep an _AnomalyMessage in the
+    private _message field and format it when message is read
+    """
+    source: str
+    cell_id: int
+    cell_name: str
+    cell_status: str
+    health_score: float
+    fault_type: str
+    severity: str
+    severity_level: int
+    _message: object
+    detected_at: int
+    metrics: dict
+    anomaly_details: dict = None
+
+    @property
+    def message(self) -> str:
+        return str(self._message)
+
+    def __getitem__(self, key):
+        if key in self:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        if key == 'anomaly_details':
+            return self.anomaly_details is not None
+        return key in _FAULT_FIELDS
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def as_dict(self):
+        """Plain dict with the same keys as the fault"""
+        return {name: self[name] for name in _FAULT_FIELDS if name in self}
+
+
+_FAULT_FIELDS = tuple(field.name.lstrip('_') for field in fields(Fault))
+
+
+class _AnomalyMessage:
+    """
+    Human-readable anomaly message, formatted only when converted to str
+    (most consumers never read it, and float formatting isn't free);
+    Fault hands it out as a str. Compares equal to its formatted text
+    """
+
+    __slots__ = ('metric', 'value', 'expected_range')
+
+    def __init__(self, metric, value, expected_range):
+        self.metric = metric
+        self.value = value
+        self.expected_range = expected_range
+
+    def __str__(self):
+        return f"{self.metric} anomaly: {self.value:.2f} (expected: {self.expected_range})"
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __eq__(self, other):
+        if isinstance(other, (str, _AnomalyMessage)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(str(self))
+
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _scan_numpy(values, min_vec, max_vec):
+    """
+    (cell, metric) positions of out-of-range values in a (cells x metrics)
+    matrix, in row-major order (NumPy). NaN values are never out of range.
+    """
+    return np.nonzero((values < min_vec) | (values > max_vec))
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True)
+    def _scan_kernel(values, min_vec, max_vec):
+        """Compiled equivalent of _scan_numpy: count hits per cell, then fill"""
+        num_cells, num_metrics = values.shape
+        counts = np.zeros(num_cells + 1, dtype=np.int64)
+        for c in prange(num_cells):
+            n = 0
+            for m in range(num_metrics):
+                v = values[c, m]
+                if v < min_vec[m] or v > max_vec[m]:
+                    n += 1
+            counts[c + 1] = n
+
+        offsets = np.cumsum(counts)
+        cell_idx = np.empty(offsets[-1], dtype=np.int64)
+        metric_idx = np.empty(offsets[-1], dtype=np.int64)
+        for c in prange(num_cells):
+            k = offsets[c]
+            for m in range(num_metrics):
+                v = values[c, m]
+                if v < min_vec[m] or v > max_vec[m]:
+                    cell_idx[k] = c
+                    metric_idx[k] = m
+                    k += 1
+
+        return cell_idx, metric_idx
+
+    _scan = _scan_kernel
+else:
+    _scan = _scan_numpy
+
 
 class FaultDetector:
     """
@@ -12,7 +170,13 @@ class FaultDetector:
     Monitors cell metrics and detects deviations from normal behavior
     """
 
-    def __init__(self, environment):
+    def __init__(self, environment, history_window=100, keep_full_history=False):
+        """
+        Args:
+            environment: Network environment to monitor
+            history_window: Number of recent scans kept in detection_history
+            keep_full_history: Also keep each scan's fault list in the history
+        """
         self.env = environment
 
         # Baseline thresholds for anomaly detection
@@ -30,10 +194,48 @@ class FaultDetector:
             'sinr': {'min': 5, 'max': 40}
         }
 
-        # Detection history
-        self.detection_history = []
+        # Thresholds as parallel arrays indexed by metric position, so the scan
+        # uses integer indexing instead of nested dict lookups
+        self._metric_names = tuple(self.thresholds)
+        self._bounds = tuple((t['min'], t['max']) for t in self.thresholds.values())
+        self._min_vec = np.array([t['min'] for t in self.thresholds.values()], dtype=float)
+        self._max_vec = np.array([t['max'] for t in self.thresholds.values()], dtype=float)
+
+        # Environment metric matrix columns of our metrics (None if it has no
+        # matrix or lacks one of them); otherwise the metrics of each cell are
+        # read in one C-level call (the metric set is fixed here)
+        columns = getattr(self.env, 'metric_columns', None)
+        if columns is not None and all(metric in columns for metric in self._metric_names):
+            self._matrix_columns = np.array([columns[metric] for metric in self._metric_names])
+        else:
+            self._matrix_columns = None
+        self._metric_getter = itemgetter(*self._metric_names)
+
+        # Strings that only depend on the metric or severity, built once
+        self._expected_range = tuple(f"{min_val}-{max_val}" for min_val, max_val in self._bounds)
+        self._fault_type_for = {metric: sys.intern(f"ANOMALY_{metric.upper()}") for metric in self.thresholds}
+        self._severity_upper = {severity: sys.intern(severity.upper())
+                                for severity in SEVERITY_LEVELS}
+
+        # Warm up the compiled scan kernel so the first detection doesn't pay for JIT
+        if NUMBA_AVAILABLE:
+            _scan_kernel(np.zeros((1, len(self._metric_names))), self._min_vec, self._max_vec)
+
+        # Detection history: the most recent scans only, plus running totals
+        # over all scans for the statistics
+        self.detection_history = deque(maxlen=history_window)
+        self.keep_full_history = keep_full_history
+        self._total_detections = 0
+        self._num_scans = 0
+        self._severity_counts = Counter()
         self.detected_anomalies = []
 
+        # Anomalies from the last scan by cell position, and the env.cell_versions
+        # they were found at; only cells changed since then are re-scanned, the
+        # others keep their entries
+        self._anomalies_by_cell = {}
+        self._seen_versions = None
+
         # Metric history for trend analysis
         self.metric_history = {cell['id']: {} for cell in self.env.cells}
 
@@ -41,154 +243,322 @@ class FaultDetector:
         """
         Scan all cells for anomalies
         Returns list of detected faults
+
+        Only cells whose env.cell_versions counter moved since this detector's
+        last scan are re-checked (all cells on the first scan), so cell metrics
+        must be changed through the environment or flagged with env.mark_dirty
         """
 
         detected_faults = []
+        cells = self.env.cells
+
+        # Re-scan only the cells whose metrics changed since the last scan
+        versions = getattr(self.env, 'cell_versions', None)
+        seen = self._seen_versions
+        if versions is None or seen is None or len(seen) != len(versions):
+            rescan = list(range(len(cells)))
+            self._anomalies_by_cell.clear()
+            previously_anomalous = set()
+        else:
+            rescan = np.flatnonzero(versions[:len(cells)] != seen[:len(cells)]).tolist()
+            previously_anomalous = self._anomalies_by_cell.keys() & set(rescan)
+        if versions is not None:
+            self._seen_versions = versions.copy()
+
+        # Healthy re-scanned cells cost no per-cell Python work: only entries of
+        # cells that were anomalous and are no longer need removing
+        found = self._detect_metric_anomalies(rescan)
+        for position in previously_anomalous - found.keys():
+            del self._anomalies_by_cell[position]
+        self._anomalies_by_cell.update(found)
+
+        alarm_bits = getattr(self.env, 'alarm_bits', None)
+        if alarm_bits is not None:
+            alarmed = set(np.flatnonzero(alarm_bits).tolist())
+        else:
+            alarmed = {i for i, cell in enumerate(cells) if cell['alarms']}
+
+        # Only cells with alarms or anomalies produce faults
+        for position in sorted(alarmed | self._anomalies_by_cell.keys()):
+            cell = cells[position]
+
+            # One metrics snapshot, shared by all faults of this cell in this scan
+            metrics = self._get_relevant_metrics(cell)
 
-        for cell in self.env.cells:
             # Check if cell has existing alarms
             if cell['alarms']:
                 for alarm in cell['alarms']:
-                    fault = self._create_fault_from_alarm(cell, alarm)
+                    fault = self._create_fault_from_alarm(cell, alarm, metrics)
                     detected_faults.append(fault)
 
-            # Check for metric anomalies
-            anomalies = self._detect_metric_anomalies(cell)
-            for anomaly in anomalies:
-                fault = self._create_fault_from_anomaly(cell, anomaly)
+            # Metric anomalies found by the scan
+            for anomaly in self._anomalies_by_cell.get(position, ()):
+                fault = self._create_fault_from_anomaly(cell, anomaly, metrics)
                 detected_faults.append(fault)
 
         # Store in history
-        self.detection_history.append({
+        scan = {
             'time': self.env.time_step,
-            'faults_detected': len(detected_faults),
-            'faults': detected_faults
-        })
+            'faults_detected': len(detected_faults)
+        }
+        if self.keep_full_history:
+            scan['faults'] = detected_faults
+        self.detection_history.append(scan)
+        self._total_detections += len(detected_faults)
+        self._num_scans += 1
+        self._severity_counts.update(fault.severity for fault in detected_faults)
 
         return detected_faults
 
-    def _detect_metric_anomalies(self, cell):
-        """Detect anomalies in cell metrics"""
-
-        anomalies = []
-
-        # Check each metric against thresholds
-        for metric, threshold in self.thresholds.items():
-            if metric not in cell:
-                continue
-
-            value = cell[metric]
-            min_val = threshold['min']
-            max_val = threshold['max']
-
-            # Check if value is outside normal range
-            if value < min_val:
-                anomalies.append({
-                    'metric': metric,
-                    'value': value,
-                    'expected_range': f"{min_val}-{max_val}",
-                    'deviation': min_val - value,
-                    'severity': self._calculate_severity(metric, value, min_val, max_val)
-                })
-
-            elif value > max_val:
-                anomalies.append({
-                    'metric': metric,
-                    'value': value,
-                    'expected_range': f"{min_val}-{max_val}",
-                    'deviation': value - max_val,
-                    'severity': self._calculate_severity(metric, value, min_val, max_val)
-                })
-
-        return anomalies
-
-    def _calculate_severity(self, metric, value, min_val, max_val):
-        """Calculate severity based on how far value deviates from normal"""
-
-        if value < min_val:
-            deviation_pct = (min_val - value) / min_val * 100 if min_val > 0 else 100
-        else:
-            deviation_pct = (value - max_val) / max_val * 100 if max_val > 0 else 100
-
-        if deviation_pct > 50:
-            return 'critical'
-        elif deviation_pct > 30:
-            return 'high'
-        elif deviation_pct > 15:
-            return 'medium'
-        else:
-            return 'low'
+    def _detect_metric_anomalies(self, positions):
+        """
+        Detect anomalies in the metrics of the given cells at once
+        Compares a (cells x metrics) value matrix against the threshold vectors,
+        anomaly records are only built for the out-of-range entries
 
-    def _create_fault_from_alarm(self, cell, alarm):
-        """Create standardized fault object from alarm"""
+        Returns:
+            Dict of cell position -> list of anomalies (cells without any are omitted)
+        """
 
-        return {
-            'source': 'alarm',
-            'cell_id': cell['id'],
-            'cell_name': cell['name'],
-            'cell_status': cell['status'],
-            'health_score': cell['health_score'],
-            'fault_type': alarm['type'],
-            'severity': alarm['severity'],
-            'message': alarm['message'],
-            'detected_at': self.env.time_step,
-            'metrics': self._get_relevant_metrics(cell, alarm['type'])
-        }
+        if not positions:
+            return {}
+
+        cells = self.env.cells
+        values = self._metric_values(positions)
+
+        cell_idx, metric_idx = _scan(values, self._min_vec, self._max_vec)
+        severity_idx = self._calculate_severity(values[cell_idx, metric_idx], metric_idx)
+
+        anomalies_by_cell = {}
+        for k, m, severity in zip(cell_idx.tolist(), metric_idx.tolist(), severity_idx.tolist()):
+            position = positions[k]
+            metric = self._metric_names[m]
+            value = cells[position][metric]
+            min_val, max_val = self._bounds[m]
+
+            anomalies_by_cell.setdefault(position, []).append({
+                'metric': metric,
+                'value': value,
+                'expected_range': self._expected_range[m],
+                'deviation': min_val - value if value < min_val else value - max_val,
+                'severity': SEVERITY_LEVELS[severity],
+                'severity_level': Severity(severity)
+            })
+
+        return anomalies_by_cell
+
+    def _metric_values(self, positions):
+        """(cells x metrics) values of the monitored metrics of the given cells"""
+
+        # Slice the environment's metric matrix when it holds all our metrics
+        if self._matrix_columns is not None:
+            return self.env.metric_matrix[np.ix_(positions, self._matrix_columns)]
+
+        rows = []
+        for position in positions:
+            cell = self.env.cells[position]
+            try:
+                rows.append(self._metric_getter(cell))
+            except KeyError:
+                # Missing metrics become NaN, which never compares out of range
+                rows.append([cell.get(metric, np.nan) for metric in self._metric_names])
+        return np.array(rows, dtype=float).reshape(len(positions), len(self._metric_names))
+
+    def _calculate_severity(self, values, metric_idx):
+        """
+        Severity index (into SEVERITY_LEVELS) of out-of-range values, based on how
+        far each deviates from the violated bound: one binary search per value
+        over SEVERITY_BOUNDS instead of an if/elif chain
+        """
 
-    def _create_fault_from_anomaly(self, cell, anomaly):
-        """Create standardized fault object from detected anomaly"""
+        min_val = self._min_vec[metric_idx]
+        max_val = self._max_vec[metric_idx]
 
-        return {
-            'source': 'anomaly_detection',
-            'cell_id': cell['id'],
-            'cell_name': cell['name'],
-            'cell_status': cell['status'],
-            'health_score': cell['health_score'],
-            'fault_type': f"ANOMALY_{anomaly['metric'].upper()}",
-            'severity': anomaly['severity'].upper(),
-            'message': f"{anomaly['metric']} anomaly: {anomaly['value']:.2f} (expected: {anomaly['expected_range']})",
-            'detected_at': self.env.time_step,
-            'anomaly_details': anomaly,
-            'metrics': self._get_relevant_metrics(cell, anomaly['metric'])
-        }
+        # A bound of 0 counts as a 100% deviation
+        with np.errstate(divide='ignore', invalid='ignore'):
+            deviation_pct = np.where(
+                values < min_val,
+                np.where(min_val > 0, (min_val - values) / min_val * 100, 100.0),
+                np.where(max_val > 0, (values - max_val) / max_val * 100, 100.0)
+            )
 
-    def _get_relevant_metrics(self, cell, fault_indicator):
-        """Get metrics relevant to the fault type"""
+        return np.searchsorted(SEVERITY_BOUNDS, deviation_pct, side='left')
 
-        # Return key metrics that help diagnose the issue
-        return {
-            'throughput': cell['throughput'],
-            'latency': cell['latency'],
-            'packet_loss': cell['packet_loss'],
-            'cpu_usage': cell['cpu_usage'],
-            'memory_usage': cell['memory_usage'],
-            'num_users': cell['num_users'],
-            'drop_rate': cell['drop_rate'],
-            'interference': cell['interference'],
-            'sinr': cell['sinr']
-        }
+    def _create_fault_from_alarm(self, cell, alarm, metrics):
+        """Create standardized fault object from alarm"""
+
+        return Fault(
+            source='alarm',
+            cell_id=cell['id'],
+            cell_name=cell['name'],
+            cell_status=cell['status'],
+            health_score=cell['health_score'],
+            fault_type=alarm['type'],
+            severity=alarm['severity'],
+            severity_level=ALARM_SEVERITY_LEVELS.get(alarm['severity'], Severity.MEDIUM),
+            _message=alarm['message'],
+            detected_at=self.env.time_step,
+            metrics=metrics
+        )
+
+    def _create_fault_from_anomaly(self, cell, anomaly, metrics):
+        """Create standardized fault object from detected anomaly"""
+
+        return Fault(
+            source='anomaly_detection',
+            cell_id=cell['id'],
+            cell_name=cell['name'],
+            cell_status=cell['status'],
+            health_score=cell['health_score'],
+            fault_type=self._fault_type_for[anomaly['metric']],
+            severity=self._severity_upper[anomaly['severity']],
+            severity_level=anomaly['severity_level'],
+            _message=_AnomalyMessage(anomaly['metric'], anomaly['value'], anomaly['expected_range']),
+            detected_at=self.env.time_step,
+            anomaly_details=anomaly,
+            metrics=metrics
+        )
+
+    def _get_relevant_metrics(self, cell):
+        """Get the key metrics that help diagnose faults of this cell"""
+        return {key: cell[key] for key in RELEVANT_METRIC_KEYS}
 
     def get_detection_statistics(self):
         """Get statistics about fault detection"""
 
-        if not self.detection_history:
+        if not self._num_scans:
             return {
                 'total_detections': 0,
                 'detection_rate': 0,
-                'average_faults_per_scan': 0
+                'average_faults_per_scan': 0,
+                'detections_by_severity': {}
             }
 
-        total_detections = sum(d['faults_detected'] for d in self.detection_history)
-        num_scans = len(self.detection_history)
+        total_detections = self._total_detections
+        num_scans = self._num_scans
 
         return {
             'total_detections': total_detections,
             'num_scans': num_scans,
             'average_faults_per_scan': total_detections / num_scans if num_scans > 0 else 0,
-            'detection_rate': (num_scans / self.env.time_step * 100) if self.env.time_step > 0 else 0
+            'detection_rate': (num_scans / self.env.time_step * 100) if self.env.time_step > 0 else 0,
+            'detections_by_severity': dict(self._severity_counts)
         }
 
 
+# Knowledge base of fault patterns and solutions, shared by all engines
+# (read-only: rules and their lists are never modified)
+_DIAGNOSIS_RULES = MappingProxyType({
+    'HARDWARE_FAULT': {
+        'indicators': ('status=failed', 'health_score<0.2'),
+        'root_causes': (
+            'Radio unit failure',
+            'Baseband unit failure',
+            'Power supply failure',
+            'Fiber connection failure'
+        ),
+        'recommended_actions': (
+            {'type': 'restart', 'description': 'Restart cell equipment', 'priority': 1},
+            {'type': 'switch_to_backup', 'description': 'Switch to backup hardware', 'priority': 2},
+            {'type': 'field_technician', 'description': 'Dispatch field technician', 'priority': 3}
+        )
+    },
+
+    'CONFIG_ERROR': {
+        'indicators': ('handover_success<80', 'drop_rate>0.1'),
+        'root_causes': (
+            'Incorrect neighbor list',
+            'Wrong PCI configuration',
+            'Handover parameter misconfiguration',
+            'Frequency band mismatch'
+        ),
+        'recommended_actions': (
+            {'type': 'reset_config', 'description': 'Reset to last known good configuration', 'priority': 1},
+            {'type': 'apply_correct_config', 'description': 'Apply correct configuration', 'priority': 2},
+            {'type': 'update_neighbor_list', 'description': 'Update neighbor cell list', 'priority': 3}
+        )
+    },
+
+    'PERFORMANCE_DEGRADED': {
+        'indicators': ('throughput<30', 'latency>25'),
+        'root_causes': (
+            'Resource block exhaustion',
+            'Scheduler misconfiguration',
+            'Transport network congestion',
+            'Software bug'
+        ),
+        'recommended_actions': (
+            {'type': 'optimize_parameters', 'description': 'Optimize cell parameters', 'priority': 1},
+            {'type': 'adjust_resources', 'description': 'Reallocate resources', 'priority': 2},
+            {'type': 'software_update', 'description': 'Apply software patch', 'priority': 3}
+        )
+    },
+
+    'CONNECTIVITY_ISSUE': {
+        'indicators': ('drop_rate>0.1', 'num_users dropping'),
+        'root_causes': (
+            'Weak coverage area',
+            'Handover failure',
+            'Core network issue',
+            'Authentication failure'
+        ),
+        'recommended_actions': (
+            {'type': 'restart_service', 'description': 'Restart connectivity services', 'priority': 1},
+            {'type': 'update_neighbor_list', 'description': 'Update handover neighbors', 'priority': 2},
+            {'type': 'adjust_power', 'description': 'Increase coverage power', 'priority': 3}
+        )
+    },
+
+    'CAPACITY_OVERLOAD': {
+        'indicators': ('cpu_usage>85', 'memory_usage>85', 'num_users>250'),
+        'root_causes': (
+            'Traffic surge',
+            'Insufficient capacity',
+            'Neighboring cell failure (users migrated)',
+            'Memory leak'
+        ),
+        'recommended_actions': (
+            {'type': 'load_balancing', 'description': 'Offload users to neighbors', 'priority': 1},
+            {'type': 'resource_expansion', 'description': 'Add capacity', 'priority': 2},
+            {'type': 'restart', 'description': 'Restart to clear memory', 'priority': 3}
+        )
+    },
+
+    'HIGH_INTERFERENCE': {
+        'indicators': ('interference>0.3', 'sinr<10'),
+        'root_causes': (
+            'Co-channel interference',
+            'Adjacent channel interference',
+            'External interference source',
+            'PCI collision'
+        ),
+        'recommended_actions': (
+            {'type': 'adjust_power', 'description': 'Reduce transmit power', 'priority': 1},
+            {'type': 'change_frequency', 'description': 'Switch to cleaner frequency', 'priority': 2},
+            {'type': 'adjust_antenna', 'description': 'Adjust antenna tilt', 'priority': 3}
+        )
+    }
+})
+
+
+def _substring_index(rule_keys):
+    """
+    substring -> position of the first rule key containing it
+    Built once, so 'fault_type in rule_key' is a single dict lookup
+    """
+    index = {}
+    for position, rule_key in enumerate(rule_keys):
+        index.setdefault('', position)
+        for start in range(len(rule_key)):
+            for end in range(start + 1, len(rule_key) + 1):
+                index.setdefault(rule_key[start:end], position)
+    return index
+
+
+_RULE_KEYS = tuple(_DIAGNOSIS_RULES)
+_RULE_SUBSTRINGS = _substring_index(_RULE_KEYS)
+
+
 class FaultDiagnosisEngine:
     """
     Root cause analysis engine
@@ -197,102 +567,14 @@ class FaultDiagnosisEngine:
 
     def __init__(self):
         # Knowledge base of fault patterns and solutions
-        self.diagnosis_rules = self._build_diagnosis_rules()
+        self.diagnosis_rules = _DIAGNOSIS_RULES
 
-    def _build_diagnosis_rules(self):
-        """Build knowledge base of diagnosis rules"""
+        # fault_type -> matching rule (or None), every rule key matches itself;
+        # other fault types are resolved by the partial match once, then cached
+        self._rule_index = {rule_key: rule for rule_key, rule in self.diagnosis_rules.items()}
 
-        return {
-            'HARDWARE_FAULT': {
-                'indicators': ['status=failed', 'health_score<0.2'],
-                'root_causes': [
-                    'Radio unit failure',
-                    'Baseband unit failure',
-                    'Power supply failure',
-                    'Fiber connection failure'
-                ],
-                'recommended_actions': [
-                    {'type': 'restart', 'description': 'Restart cell equipment', 'priority': 1},
-                    {'type': 'switch_to_backup', 'description': 'Switch to backup hardware', 'priority': 2},
-                    {'type': 'field_technician', 'description': 'Dispatch field technician', 'priority': 3}
-                ]
-            },
-
-            'CONFIG_ERROR': {
-                'indicators': ['handover_success<80', 'drop_rate>0.1'],
-                'root_causes': [
-                    'Incorrect neighbor list',
-                    'Wrong PCI configuration',
-                    'Handover parameter misconfiguration',
-                    'Frequency band mismatch'
-                ],
-                'recommended_actions': [
-                    {'type': 'reset_config', 'description': 'Reset to last known good configuration', 'priority': 1},
-                    {'type': 'apply_correct_config', 'description': 'Apply correct configuration', 'priority': 2},
-                    {'type': 'update_neighbor_list', 'description': 'Update neighbor cell list', 'priority': 3}
-                ]
-            },
-
-            'PERFORMANCE_DEGRADED': {
-                'indicators': ['throughput<30', 'latency>25'],
-                'root_causes': [
-                    'Resource block exhaustion',
-                    'Scheduler misconfiguration',
-                    'Transport network congestion',
-                    'Software bug'
-                ],
-                'recommended_actions': [
-                    {'type': 'optimize_parameters', 'description': 'Optimize cell parameters', 'priority': 1},
-                    {'type': 'adjust_resources', 'description': 'Reallocate resources', 'priority': 2},
-                    {'type': 'software_update', 'description': 'Apply software patch', 'priority': 3}
-                ]
-            },
-
-            'CONNECTIVITY_ISSUE': {
-                'indicators': ['drop_rate>0.1', 'num_users dropping'],
-                'root_causes': [
-                    'Weak coverage area',
-                    'Handover failure',
-                    'Core network issue',
-                    'Authentication failure'
-                ],
-                'recommended_actions': [
-                    {'type': 'restart_service', 'description': 'Restart connectivity services', 'priority': 1},
-                    {'type': 'update_neighbor_list', 'description': 'Update handover neighbors', 'priority': 2},
-                    {'type': 'adjust_power', 'description': 'Increase coverage power', 'priority': 3}
-                ]
-            },
-
-            'CAPACITY_OVERLOAD': {
-                'indicators': ['cpu_usage>85', 'memory_usage>85', 'num_users>250'],
-                'root_causes': [
-                    'Traffic surge',
-                    'Insufficient capacity',
-                    'Neighboring cell failure (users migrated)',
-                    'Memory leak'
-                ],
-                'recommended_actions': [
-                    {'type': 'load_balancing', 'description': 'Offload users to neighbors', 'priority': 1},
-                    {'type': 'resource_expansion', 'description': 'Add capacity', 'priority': 2},
-                    {'type': 'restart', 'description': 'Restart to clear memory', 'priority': 3}
-                ]
-            },
-
-            'HIGH_INTERFERENCE': {
-                'indicators': ['interference>0.3', 'sinr<10'],
-                'root_causes': [
-                    'Co-channel interference',
-                    'Adjacent channel interference',
-                    'External interference source',
-                    'PCI collision'
-                ],
-                'recommended_actions': [
-                    {'type': 'adjust_power', 'description': 'Reduce transmit power', 'priority': 1},
-                    {'type': 'change_frequency', 'description': 'Switch to cleaner frequency', 'priority': 2},
-                    {'type': 'adjust_antenna', 'description': 'Adjust antenna tilt', 'priority': 3}
-                ]
-            }
-        }
+        # fault_type -> diagnosis, which only depends on the fault type
+        self._diagnosis_cache = {}
 
     def diagnose(self, fault):
         """
@@ -304,6 +586,34 @@ class FaultDiagnosisEngine:
 
         fault_type = fault['fault_type']
 
+        cached = self._diagnosis_cache.get(fault_type)
+        if cached is not None:
+            return dict(cached)
+
+        diagnosis = self._build_diagnosis(fault, fault_type)
+        self._diagnosis_cache[fault_type] = diagnosis
+        return dict(diagnosis)
+
+    def diagnose_batch(self, faults):
+        """
+        Diagnose many faults at once
+        The diagnosis only depends on the fault type, so it is built once per
+        distinct type and shared by every fault of that type (treat as read-only)
+
+        Returns:
+            List of diagnoses, aligned with faults
+        """
+
+        first_of_type = {}
+        for fault in faults:
+            first_of_type.setdefault(fault['fault_type'], fault)
+
+        by_type = {fault_type: self.diagnose(fault) for fault_type, fault in first_of_type.items()}
+        return [by_type[fault['fault_type']] for fault in faults]
+
+    def _build_diagnosis(self, fault, fault_type):
+        """Diagnosis for a fault type (see diagnose)"""
+
         # Find matching diagnosis rule
         rule = self._find_matching_rule(fault_type)
 
@@ -313,9 +623,9 @@ class FaultDiagnosisEngine:
                 'fault_type': fault_type,
                 'root_cause': 'Unknown - requires manual investigation',
                 'confidence': 0.5,
-                'recommended_actions': [
-                    {'type': 'generic_restart', 'description': 'Generic restart action', 'priority': 1}
-                ]
+                'recommended_actions': (
+                    {'type': 'generic_restart', 'description': 'Generic restart action', 'priority': 1},
+                )
             }
 
         # Analyze metrics to determine most likely root cause
@@ -335,16 +645,25 @@ class FaultDiagnosisEngine:
     def _find_matching_rule(self, fault_type):
         """Find diagnosis rule that matches the fault type"""
 
-        # Direct match
-        if fault_type in self.diagnosis_rules:
-            return self.diagnosis_rules[fault_type]
-
-        # Partial match
-        for rule_key, rule in self.diagnosis_rules.items():
-            if rule_key in fault_type or fault_type in rule_key:
-                return rule
+        # Direct match, or a fault type seen before
+        if fault_type in self._rule_index:
+            return self._rule_index[fault_type]
+
+        # Partial match: the first rule (in rule order) whose key contains the
+        # fault type, or is contained in it; only the rules before the first
+        # containing one need a substring scan
+        match = None
+        first_containing = _RULE_SUBSTRINGS.get(fault_type, len(_RULE_KEYS))
+        for rule_key in _RULE_KEYS[:first_containing]:
+            if rule_key in fault_type:
+                match = self.diagnosis_rules[rule_key]
+                break
+        else:
+            if first_containing < len(_RULE_KEYS):
+                match = self.diagnosis_rules[_RULE_KEYS[first_containing]]
 
-        return None
+        self._rule_index[fault_type] = match
+        return match
 
     def _analyze_root_cause(self, fault, rule):
         """Analyze metrics to determine most likely root cause"""
@@ -357,7 +676,9 @@ class FaultDiagnosisEngine:
         return "Unknown"
 
 
-if __name__ == "__main__":
+def _selftest():
+    """Demo run: inject faults into a small network, detect and diagnose them"""
+    # Imported here so importing this module never loads the environment
     from healing_environment import NetworkHealingEnvironment, FaultType
 
     print("Testing Fault Detection System...")
@@ -397,3 +718,7 @@ if __name__ == "__main__":
             print(f"    {action['priority']}. {action['description']}")
 
     print("\n[PASS] Fault detection and diagnosis test PASSED")
+
+
+if __name__ == "__main__":
+    _selftest()
@@ -3,8 +3,117 @@ Autonomous Network Healing Agent
 THE INNOVATION: Detects, diagnoses, and heals network faults automatically
 """
 
+import sys
+import random
 import numpy as np
 from collections import deque
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from operator import itemgetter
+
+# Initial shape of the effectiveness score matrix (grown when needed)
+INITIAL_FAULT_ROWS = 8
+INITIAL_ACTION_COLUMNS = 4
+
+# Columns of CycleResult.actions_taken, one entry per healing action
+ACTION_RECORD_FIELDS = ('cell_id', 'cell_name', 'fault_type', 'action', 'success')
+
+
+def _empty_action_columns():
+    return {name: [] for name in ACTION_RECORD_FIELDS}
+
+
+@dataclass(slots=True)
+class CycleResult:
+    """
+    Results of one healing cycle
+    Fields are also readable dict-style (result['faults_detected']) for
+    existing callers; actions_taken holds one list per ACTION_RECORD_FIELDS
+    column (see iter_actions_taken)
+    """
+    time: int
+    faults_detected: int = 0
+    faults_diagnosed: int = 0
+    healing_attempts: int = 0
+    successful_heals: int = 0
+    failed_heals: int = 0
+    actions_taken: dict = field(default_factory=_empty_action_columns)
+
+    def __getitem__(self, key):
+        if key in _CYCLE_RESULT_FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in _CYCLE_RESULT_FIELDS
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def as_dict(self):
+        """Plain dict with the same keys as the result"""
+        return {name: getattr(self, name) for name in _CYCLE_RESULT_FIELDS}
+
+
+_CYCLE_RESULT_FIELDS = tuple(f.name for f in fields(CycleResult))
+
+
+def iter_actions_taken(cycle_result):
+    """Actions taken in a healing cycle, one dict per action"""
+    columns = cycle_result['actions_taken']
+    for values in zip(*(columns[name] for name in ACTION_RECORD_FIELDS)):
+        yield dict(zip(ACTION_RECORD_FIELDS, values))
+
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _update_score_numpy(scores, row, column, success):
+    """
+    Move one effectiveness score up/down by 0.1 within [0, 1] (NaN = untried,
+    starts at 0.5) and return the row's best column, the first one on ties
+    """
+    score = scores[row, column]
+    if np.isnan(score):
+        score = 0.5
+    score += 0.1 if success else -0.1
+    if score > 1.0:
+        score = 1.0
+    elif score < 0.0:
+        score = 0.0
+    scores[row, column] = score
+    return int(np.nanargmax(scores[row]))
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _update_score_kernel(scores, row, column, success):
+        """Compiled equivalent of _update_score_numpy"""
+        score = scores[row, column]
+        if np.isnan(score):
+            score = 0.5
+        score += 0.1 if success else -0.1
+        if score > 1.0:
+            score = 1.0
+        elif score < 0.0:
+            score = 0.0
+        scores[row, column] = score
+
+        best = 0
+        best_score = -np.inf
+        for c in range(scores.shape[1]):
+            if scores[row, c] > best_score:
+                best = c
+                best_score = scores[row, c]
+        return best
+
+    _update_score = _update_score_kernel
+else:
+    _update_score = _update_score_numpy
 
 class NetworkHealingAgent:
     """
@@ -16,18 +125,47 @@ class NetworkHealingAgent:
     5. Learn from outcomes
     """
 
-    def __init__(self, environment, detector, diagnosis_engine):
+    def __init__(self, environment, detector, diagnosis_engine, history_limit=10_000):
+        """
+        Args:
+            environment: Network environment to heal
+            detector: Fault detector monitoring the environment
+            diagnosis_engine: Root cause analysis engine
+            history_limit: Number of recent cycles kept in healing_history
+                (None = keep all)
+        """
         self.env = environment
         self.detector = detector
         self.diagnosis_engine = diagnosis_engine
 
-        # Healing history
-        self.healing_history = []
+        # Healing history: the most recent cycles only, plus a running count
+        self.healing_history = deque(maxlen=history_limit)
+        self._cycles_recorded = 0
         self.success_count = 0
         self.failure_count = 0
 
         # Learning: track which actions work best for which faults
-        self.action_effectiveness = {}
+        # Effectiveness scores, one row per fault type and one column per action
+        # type tried for it (in first-tried order); NaN = not tried
+        self._fault_rows = {}       # fault_type -> row
+        self._action_columns = []   # row -> {action_type: column}
+        self._action_types = []     # row -> action types in column order
+        self._scores = np.full((INITIAL_FAULT_ROWS, INITIAL_ACTION_COLUMNS), np.nan)
+
+        # Warm up the compiled score update so the first healing doesn't pay for JIT
+        if NUMBA_AVAILABLE:
+            _update_score_kernel(np.full((1, 1), np.nan), 0, 0, True)
+
+        # fault_type -> its most effective action type (first one on ties),
+        # updated along with the scores
+        self._best_action = {}
+
+        # fault_type -> {action type: recommended action}; the recommended
+        # actions of a fault type come from the fixed diagnosis rules
+        self._actions_by_type = {}
+
+        # fault_type -> its highest priority recommended action
+        self._top_action = {}
 
     def run_healing_cycle(self):
         """
@@ -35,70 +173,66 @@ class NetworkHealingAgent:
         Returns results of the cycle
         """
 
-        cycle_result = {
-            'time': self.env.time_step,
-            'faults_detected': 0,
-            'faults_diagnosed': 0,
-            'healing_attempts': 0,
-            'successful_heals': 0,
-            'failed_heals': 0,
-            'actions_taken': []
-        }
+        cycle_result = CycleResult(time=self.env.time_step)
 
         # Step 1: Detect faults
         detected_faults = self.detector.detect_faults()
-        cycle_result['faults_detected'] = len(detected_faults)
+        cycle_result.faults_detected = len(detected_faults)
 
         if not detected_faults:
             # No faults detected - network is healthy
             return cycle_result
 
-        # Step 2: Diagnose each fault
-        diagnoses = []
-        for fault in detected_faults:
-            diagnosis = self.diagnosis_engine.diagnose(fault)
-            diagnoses.append({
-                'fault': fault,
-                'diagnosis': diagnosis
-            })
-            cycle_result['faults_diagnosed'] += 1
-
-        # Step 3: Execute healing actions
-        for item in diagnoses:
-            fault = item['fault']
-            diagnosis = item['diagnosis']
-
+        # Step 2: Diagnose all faults in one batch (once per distinct fault type)
+        diagnoses = self.diagnosis_engine.diagnose_batch(detected_faults)
+        cycle_result.faults_diagnosed = len(diagnoses)
+
+        # Step 3: Execute healing actions (hot loop: methods and column appends
+        # bound to locals, counters summed after the loop)
+        select_action = self._select_healing_action
+        execute_healing = self._execute_healing
+        learn_from_outcome = self._learn_from_outcome
+        actions_taken = cycle_result.actions_taken
+        record_cell_id = actions_taken['cell_id'].append
+        record_cell_name = actions_taken['cell_name'].append
+        record_fault_type = actions_taken['fault_type'].append
+        record_action = actions_taken['action'].append
+        record_success = actions_taken['success'].append
+
+        successful_heals = 0
+        for fault, diagnosis in zip(detected_faults, diagnoses):
             # Select best action based on learning (or use recommended)
-            action = self._select_healing_action(diagnosis)
+            action = select_action(diagnosis)
 
             # Execute healing
-            success = self._execute_healing(fault, action)
-
-            cycle_result['healing_attempts'] += 1
+            success = execute_healing(fault, action)
             if success:
-                cycle_result['successful_heals'] += 1
-                self.success_count += 1
-            else:
-                cycle_result['failed_heals'] += 1
-                self.failure_count += 1
+                successful_heals += 1
 
             # Record action
-            cycle_result['actions_taken'].append({
-                'cell_id': fault['cell_id'],
-                'cell_name': fault['cell_name'],
-                'fault_type': fault['fault_type'],
-                'action': action,
-                'success': success
-            })
+            record_cell_id(fault['cell_id'])
+            record_cell_name(fault['cell_name'])
+            record_fault_type(fault['fault_type'])
+            record_action(action)
+            record_success(success)
 
             # Learn from outcome
-            self._learn_from_outcome(diagnosis, action, success)
+            learn_from_outcome(diagnosis, action, success)
+
+        cycle_result.healing_attempts = len(diagnoses)
+        cycle_result.successful_heals = successful_heals
+        cycle_result.failed_heals = len(diagnoses) - successful_heals
+        self.success_count += successful_heals
+        self.failure_count += cycle_result.failed_heals
 
-        # Step 4: Verify healing
-        self._verify_healing()
+        # Step 4: Verify healing (failed heals leave the network unchanged, and
+        # cycles without faults returned above)
+        if cycle_result.successful_heals:
+            self._verify_healing()
 
         # Store in history
         self.healing_history.append(cycle_result)
+        self._cycles_recorded += 1
 
         return cycle_result
 
@@ -109,23 +243,36 @@ class NetworkHealingAgent:
         Uses learned effectiveness if available, otherwise uses recommended action
         """
 
-        fault_type = diagnosis['fault_type']
+        # Interned, so the per-fault-type lookups compare keys by identity
+        fault_type = sys.intern(diagnosis['fault_type'])
         recommended_actions = diagnosis['recommended_actions']
 
         # Check if we've learned which action works best for this fault type
-        if fault_type in self.action_effectiveness:
+        if fault_type in self._best_action:
             # Use most effective action we've learned
-            effectiveness = self.action_effectiveness[fault_type]
-            best_action_type = max(effectiveness, key=effectiveness.get)
+            best_action_type = self._best_action[fault_type]
 
             # Find the full action details
-            for action in recommended_actions:
-                if action['type'] == best_action_type:
-                    return action
+            actions_by_type = self._actions_by_type.get(fault_type)
+            if actions_by_type is None:
+                actions_by_type = {}
+                for action in recommended_actions:
+                    actions_by_type.setdefault(action['type'], action)
+                self._actions_by_type[fault_type] = actions_by_type
+
+            action = actions_by_type.get(best_action_type)
+            if action is not None:
+                return action
 
         # No learning data yet - use highest priority recommended action
+        # (priority 1 is the highest, the first one on ties)
+        top_action = self._top_action.get(fault_type)
+        if top_action is not None:
+            return top_action
         if recommended_actions:
-            return recommended_actions[0]  # Highest priority
+            top_action = min(recommended_actions, key=itemgetter('priority'))
+            self._top_action[fault_type] = top_action
+            return top_action
 
         # Fallback
         return {'type': 'generic_restart', 'description': 'Generic restart', 'priority': 1}
@@ -140,12 +287,9 @@ class NetworkHealingAgent:
         cell_id = fault['cell_id']
 
         # Find the actual fault object in the environment
-        # Match by cell_id (simpler and more reliable)
-        env_fault = None
-        for active_fault in self.env.active_faults:
-            if active_fault['cell_id'] == cell_id:
-                env_fault = active_fault
-                break
+        # Match by cell_id (simpler and more reliable): oldest active fault of the cell
+        cell_faults = self.env.active_faults_by_cell.get(cell_id)
+        env_fault = cell_faults[0] if cell_faults else None
 
         if not env_fault:
             # Fault not found in environment (maybe already healed?)
@@ -162,28 +306,45 @@ class NetworkHealingAgent:
         Updates action effectiveness scores
         """
 
-        fault_type = diagnosis['fault_type']
-        action_type = action['type']
+        fault_type = sys.intern(diagnosis['fault_type'])
+        action_type = sys.intern(action['type'])
 
         # Initialize if first time seeing this fault type
-        if fault_type not in self.action_effectiveness:
-            self.action_effectiveness[fault_type] = {}
+        row = self._fault_rows.get(fault_type)
+        if row is None:
+            row = len(self._fault_rows)
+            self._fault_rows[fault_type] = row
+            self._action_columns.append({})
+            self._action_types.append([])
 
         # Initialize if first time trying this action for this fault
-        if action_type not in self.action_effectiveness[fault_type]:
-            self.action_effectiveness[fault_type][action_type] = 0.5  # Start with neutral
-
-        # Update effectiveness score
-        current_score = self.action_effectiveness[fault_type][action_type]
-
-        if success:
-            # Increase score (but not above 1.0)
-            new_score = min(1.0, current_score + 0.1)
-        else:
-            # Decrease score (but not below 0.0)
-            new_score = max(0.0, current_score - 0.1)
-
-        self.action_effectiveness[fault_type][action_type] = new_score
+        columns = self._action_columns[row]
+        column = columns.get(action_type)
+        if column is None:
+            column = len(columns)
+            columns[action_type] = column
+            self._action_types[row].append(action_type)
+
+        if row >= self._scores.shape[0] or column >= self._scores.shape[1]:
+            self._grow_scores(row + 1, column + 1)
+
+        # Update effectiveness score (untried actions start neutral, at 0.5);
+        # the first best column is the first tried action on ties
+        best_column = _update_score(self._scores, row, column, success)
+        self._best_action[fault_type] = self._action_types[row][best_column]
+
+    def _grow_scores(self, min_rows, min_columns):
+        """Enlarge the score matrix (doubling) to hold at least the given shape"""
+
+        rows, columns = self._scores.shape
+        while rows < min_rows:
+            rows *= 2
+        while columns < min_columns:
+            columns *= 2
+
+        scores = np.full((rows, columns), np.nan)
+        scores[:self._scores.shape[0], :self._scores.shape[1]] = self._scores
+        self._scores = scores
 
     def _verify_healing(self):
         """
@@ -198,11 +359,17 @@ class NetworkHealingAgent:
         # For this POC, we just check if active faults decreased
         return current_health['active_faults']
 
-    def run_autonomous_healing(self, num_cycles=10):
+    def run_autonomous_healing(self, num_cycles=10, stop_after_stable=None):
         """
         Run autonomous healing for multiple cycles
 
         This simulates the agent running continuously, detecting and healing faults
+
+        Args:
+            num_cycles: Maximum number of healing cycles
+            stop_after_stable: Stop early once no fault has been active for this
+                many consecutive cycles (None = run all cycles);
+                results['cycles'] then only holds the cycles run
         """
 
         results = {
@@ -219,35 +386,51 @@ class NetworkHealingAgent:
         # Record initial health
         results['initial_health'] = self.env.get_network_health()
 
+        # Per-cycle counters, summed once after the run:
+        # faults detected, healing attempts, successful heals, failed heals
+        counts = np.zeros((num_cycles, 4), dtype=np.int64)
+
         # Run healing cycles
+        step = self.env.step
+        run_healing_cycle = self.run_healing_cycle
+        record_cycle = results['cycles'].append
+        stable_cycles = 0
         for cycle in range(num_cycles):
             # Advance time
-            self.env.step()
+            step()
 
             # Run healing cycle
-            cycle_result = self.run_healing_cycle()
-            results['cycles'].append(cycle_result)
-
-            # Aggregate statistics
-            results['total_faults_detected'] += cycle_result['faults_detected']
-            results['total_healing_attempts'] += cycle_result['healing_attempts']
-            results['total_successful_heals'] += cycle_result['successful_heals']
-            results['total_failed_heals'] += cycle_result['failed_heals']
+            cycle_result = run_healing_cycle()
+            record_cycle(cycle_result)
+
+            counts[cycle] = (cycle_result.faults_detected, cycle_result.healing_attempts,
+                             cycle_result.successful_heals, cycle_result.failed_heals)
+
+            # Network healed: the remaining cycles would have nothing left to heal
+            if stop_after_stable is not None:
+                if not self.env.active_faults:
+                    stable_cycles += 1
+                    if stable_cycles >= stop_after_stable:
+                        break
+                else:
+                    stable_cycles = 0
+
+        # Aggregate statistics
+        totals = counts.sum(axis=0).tolist()
+        (results['total_faults_detected'], results['total_healing_attempts'],
+         results['total_successful_heals'], results['total_failed_heals']) = totals
 
         # Record final health
         results['final_health'] = self.env.get_network_health()
 
-        # Calculate improvement
+        # Calculate improvement and success rate in one division; no attempts
+        # (0 / 0) gives a success rate of 0
         initial_avg_health = results['initial_health']['average_health']
         final_avg_health = results['final_health']['average_health']
-        results['health_improvement'] = ((final_avg_health - initial_avg_health) / initial_avg_health * 100)
-
-        # Calculate success rate
-        total_attempts = results['total_healing_attempts']
-        if total_attempts > 0:
-            results['success_rate'] = (results['total_successful_heals'] / total_attempts * 100)
-        else:
-            results['success_rate'] = 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratios = (np.array([final_avg_health - initial_avg_health, totals[2]], dtype=np.float64) /
+                      np.array([initial_avg_health, totals[1]], dtype=np.float64))
+        results['health_improvement'], results['success_rate'] = (np.nan_to_num(ratios) * 100).tolist()
 
         return results
 
@@ -262,79 +445,132 @@ class NetworkHealingAgent:
             'successful_heals': self.success_count,
             'failed_heals': self.failure_count,
             'success_rate': success_rate,
-            'cycles_completed': len(self.healing_history),
-            'learned_patterns': len(self.action_effectiveness)
+            'cycles_completed': self._cycles_recorded,
+            'learned_patterns': len(self._fault_rows)
         }
 
     def get_learned_knowledge(self):
         """Get what the agent has learned about effective healing actions"""
 
-        return self.action_effectiveness.copy()
+        return {
+            fault_type: {
+                action_type: float(self._scores[row, column])
+                for action_type, column in self._action_columns[row].items()
+            }
+            for fault_type, row in self._fault_rows.items()
+        }
 
 
-class HealingComparison:
+# Severities drawn for the comparison faults
+FAULT_SEVERITIES = ('low', 'medium', 'high', 'critical')
+
+
+@lru_cache(maxsize=1)
+def _comparison_deps():
     """
-    Utility class to compare WITH vs WITHOUT autonomous healing
+    Environment, fault types and detection classes used by the comparison scenarios
+    Imported on first use rather than with this module, then cached per process
     """
+    from healing_environment import NetworkHealingEnvironment, FAULT_TYPES
+    from fault_detector import FaultDetector, FaultDiagnosisEngine
+    return NetworkHealingEnvironment, FAULT_TYPES, FaultDetector, FaultDiagnosisEngine
 
-    @staticmethod
-    def run_comparison(num_cells=10, num_faults=5, num_cycles=10):
-        """
-        Run comparison between manual fault management and autonomous healing
 
-        Returns comparison results showing the benefit of autonomous healing
-        """
+def _inject_random_faults(env, num_faults, seed):
+    """Inject num_faults faults drawn from random.Random(seed): same seed, same faults"""
+
+    _, fault_types, _, _ = _comparison_deps()
+
+    rng = random.Random(seed)
+    for _ in range(num_faults):
+        fault_type = rng.choice(fault_types)
+        severity = rng.choice(FAULT_SEVERITIES)
+        env.inject_fault(fault_type, cell_id=rng.randrange(env.num_cells), severity=severity)
 
-        from healing_environment import NetworkHealingEnvironment, FaultType
-        from fault_detector import FaultDetector, FaultDiagnosisEngine
-        import random
 
-        fault_types = [
-            FaultType.HARDWARE_FAILURE,
-            FaultType.CONFIGURATION_ERROR,
-            FaultType.PERFORMANCE_DEGRADATION,
-            FaultType.CONNECTIVITY_ISSUE,
-            FaultType.CAPACITY_OVERLOAD,
-            FaultType.INTERFERENCE_SPIKE
-        ]
+def _run_without_healing(num_cells, num_faults, num_cycles, seed):
+    """
+    Scenario 1: WITHOUT autonomous healing (faults remain unresolved)
+    Returns (initial health, final health)
+    """
+
+    NetworkHealingEnvironment, _, _, _ = _comparison_deps()
 
-        print("Running WITHOUT autonomous healing...")
+    print("Running WITHOUT autonomous healing...")
 
-        # Scenario 1: WITHOUT autonomous healing (faults remain unresolved)
-        env_without = NetworkHealingEnvironment(num_cells=num_cells)
-        initial_health_without = env_without.get_network_health()
+    env_without = NetworkHealingEnvironment(num_cells=num_cells)
+    initial_health_without = env_without.get_network_health()
 
-        # Inject faults
-        for _ in range(num_faults):
-            fault_type = random.choice(fault_types)
-            severity = random.choice(['low', 'medium', 'high', 'critical'])
-            env_without.inject_fault(fault_type, severity=severity)
+    # Inject faults
+    _inject_random_faults(env_without, num_faults, seed)
 
-        # Let time pass without healing
-        for _ in range(num_cycles):
-            env_without.step()
+    # Let time pass without healing
+    for _ in range(num_cycles):
+        env_without.step()
 
-        final_health_without = env_without.get_network_health()
+    return initial_health_without, env_without.get_network_health()
 
-        print("Running WITH autonomous healing...")
 
-        # Scenario 2: WITH autonomous healing
-        env_with = NetworkHealingEnvironment(num_cells=num_cells)
-        detector = FaultDetector(env_with)
-        diagnosis_engine = FaultDiagnosisEngine()
-        healing_agent = NetworkHealingAgent(env_with, detector, diagnosis_engine)
+def _run_with_healing(num_cells, num_faults, num_cycles, seed):
+    """
+    Scenario 2: WITH autonomous healing
+    Returns (initial health, run_autonomous_healing results)
+    """
 
-        initial_health_with = env_with.get_network_health()
+    NetworkHealingEnvironment, _, FaultDetector, FaultDiagnosisEngine = _comparison_deps()
 
-        # Inject same faults
-        random.seed(42)  # Use same random seed for fair comparison
-        for _ in range(num_faults):
-            fault_type = random.choice(fault_types)
-            severity = random.choice(['low', 'medium', 'high', 'critical'])
-            env_with.inject_fault(fault_type, severity=severity)
+    print("Running WITH autonomous healing...")
 
-        # Run autonomous healing
-        healing_results = healing_agent.run_autonomous_healing(num_cycles=num_cycles)
+    env_with = NetworkHealingEnvironment(num_cells=num_cells)
+    detector = FaultDetector(env_with)
+    diagnosis_engine = FaultDiagnosisEngine()
+    healing_agent = NetworkHealingAgent(env_with, detector, diagnosis_engine)
+
+    initial_health_with = env_with.get_network_health()
+
+    # Inject same faults (same seed for fair comparison)
+    _inject_random_faults(env_with, num_faults, seed)
+
+    # Run autonomous healing
+    return initial_health_with, healing_agent.run_autonomous_healing(num_cycles=num_cycles)
+
+
+class HealingComparison:
+    """
+    Utility class to compare WITH vs WITHOUT autonomous healing
+    """
+
+    @staticmethod
+    def run_comparison(num_cells=10, num_faults=5, num_cycles=10, seed=42, parallel=False):
+        """
+        Run comparison between manual fault management and autonomous healing
+
+        Both scenarios get the same faults (type, severity and cell), drawn from
+        a private random generator seeded with seed
+
+        Args:
+            parallel: Run the two (independent) scenarios in two worker
+                processes; only pays off when they outlast process startup,
+                i.e. for large networks or many cycles
+
+        Returns comparison results showing the benefit of autonomous healing
+        """
+
+        scenario_args = (num_cells, num_faults, num_cycles, seed)
+        if parallel:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # spawn, not fork: forking after a parallel Numba kernel has run
+            # copies its live threading layer and hangs interpreter shutdown
+            with ProcessPoolExecutor(max_workers=2,
+                                     mp_context=multiprocessing.get_context('spawn')) as pool:
+                without_future = pool.submit(_run_without_healing, *scenario_args)
+                with_future = pool.submit(_run_with_healing, *scenario_args)
+                initial_health_without, final_health_without = without_future.result()
+                initial_health_with, healing_results = with_future.result()
+        else:
+            initial_health_without, final_health_without = _run_without_healing(*scenario_args)
+            initial_health_with, healing_results = _run_with_healing(*scenario_args)
 
         # Compare results
         comparison = {
@@ -6,6 +6,8 @@ Supports both real data from CSV and simulated data modes
 
 import numpy as np
 import random
+from collections.abc import MutableMapping
+from enum import IntEnum
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List
 
@@ -18,6 +20,258 @@ class FaultType:
     CAPACITY_OVERLOAD = "capacity_overload"
     INTERFERENCE_SPIKE = "interference_spike"
 
+FAULT_TYPES = (
+    FaultType.HARDWARE_FAILURE,
+    FaultType.CONFIGURATION_ERROR,
+    FaultType.PERFORMANCE_DEGRADATION,
+    FaultType.CONNECTIVITY_ISSUE,
+    FaultType.CAPACITY_OVERLOAD,
+    FaultType.INTERFERENCE_SPIKE
+)
+
+# Cell metrics watched by the fault detector
+MONITORED_METRICS = (
+    'throughput', 'latency', 'packet_loss', 'availability', 'cpu_usage', 'memory_usage',
+    'temperature', 'drop_rate', 'handover_success', 'interference', 'sinr'
+)
+
+# Float cell state stored in NetworkHealingEnvironment.metric_matrix, one
+# column each (monitored metrics first)
+STATE_METRICS = MONITORED_METRICS + ('health_score', 'qos_satisfaction')
+METRIC_COLUMNS = {metric: column for column, metric in enumerate(STATE_METRICS)}
+
+# Per-step random variation (uniform range) and clamp range of the healthy
+# cells' metrics, in draw order; num_users varies by [-10, 10) and stays >= 0
+STEP_VARIATIONS = (
+    ('throughput', (-2, 2), (0, 1000)),
+    ('latency', (-1, 1), (5, np.inf)),
+    ('cpu_usage', (-5, 5), (0, 100)),
+)
+
+# Healthy baseline metrics restored after healing, with their defaults
+BASELINE_METRICS = {'throughput': 50.0, 'latency': 12.5, 'packet_loss': 0.25}
+
+# Record of a resolved fault in NetworkHealingEnvironment.fault_history ('type'
+# and 'severity' as FAULT_TYPE_CODES / SEVERITY_CODES codes, 'type' -1 for a
+# type outside FAULT_TYPES); get_fault_history() decodes them back to dicts
+FAULT_RECORD_DTYPE = np.dtype([
+    ('id', np.int64), ('type', np.int8), ('cell_id', np.int32), ('severity', np.int8),
+    ('start_time', np.int64), ('end_time', np.int64),
+    ('detected', np.bool_), ('diagnosed', np.bool_), ('healed', np.bool_),
+])
+INITIAL_FAULT_RECORDS = 1024
+
+
+class CellStatus(IntEnum):
+    """Cell status codes, stored as int8 in NetworkHealingEnvironment.status_codes"""
+    OPERATIONAL = 0
+    DEGRADED = 1
+    FAILED = 2
+    OVERLOADED = 3
+
+
+# Cell status names (the 'status' values seen through the cells), by code
+CELL_STATUSES = tuple(status.name.lower() for status in CellStatus)
+STATUS_CODES = {status: code for code, status in enumerate(CELL_STATUSES)}
+
+# Cell fields stored in the environment's arrays rather than in the cell dicts
+ARRAY_FIELDS = frozenset(STATE_METRICS) | {'num_users', 'status'}
+
+# Bit of each alarm type in NetworkHealingEnvironment.alarm_bits (other types
+# share the top bit)
+ALARM_TYPES = (
+    'HARDWARE_FAULT', 'CONFIG_ERROR', 'PERFORMANCE_DEGRADED',
+    'CONNECTIVITY_ISSUE', 'CAPACITY_OVERLOAD', 'HIGH_INTERFERENCE'
+)
+ALARM_TYPE_BITS = {alarm_type: 1 << bit for bit, alarm_type in enumerate(ALARM_TYPES)}
+OTHER_ALARM_BIT = 1 << 31
+
+
+def alarm_mask(alarms):
+    """Bitmask of the alarm types present in a list of alarms"""
+    mask = 0
+    for alarm in alarms:
+        mask |= ALARM_TYPE_BITS.get(alarm['type'], OTHER_ALARM_BIT)
+    return mask
+
+
+# Fault type codes (positions in FAULT_TYPES)
+FAULT_TYPE_CODES = {fault_type: code for code, fault_type in enumerate(FAULT_TYPES)}
+
+# Effects of each fault type (FAULT_TYPES order) on its cell, for an effective
+# severity sev: the new status and health score, then per metric
+# metric = min(cap, metric * (1 + scale * sev) + shift * sev), and
+# num_users = int(num_users * (1 + num_users_scale * sev)); the alarm raised
+# is (type, severity, message)
+FAULT_EFFECTS = (
+    # Hardware failure: severe impact on all metrics
+    {'status': CellStatus.FAILED, 'health_score': 0.1,
+     'scale': {'throughput': -0.9, 'latency': 5},
+     'shift': {'packet_loss': 10, 'availability': -20},
+     'alarm': ('HARDWARE_FAULT', 'CRITICAL', "Hardware component failure detected in {cell_type} cell")},
+    # Config error: impacts connectivity and performance
+    {'status': CellStatus.DEGRADED, 'health_score': 0.4,
+     'scale': {'throughput': -0.4},
+     'shift': {'handover_success': -15, 'drop_rate': 0.05},
+     'alarm': ('CONFIG_ERROR', 'MAJOR', "Configuration mismatch detected")},
+    # Performance degradation: gradual decline
+    {'status': CellStatus.DEGRADED, 'health_score': 0.5,
+     'scale': {'throughput': -0.5, 'latency': 2, 'qos_satisfaction': -0.3},
+     'shift': {'packet_loss': 3},
+     'alarm': ('PERFORMANCE_DEGRADED', 'MAJOR', "Performance below threshold")},
+    # Connectivity issue: affects user connections
+    {'status': CellStatus.DEGRADED, 'health_score': 0.6,
+     'shift': {'drop_rate': 0.1, 'handover_success': -20},
+     'num_users_scale': -0.4,
+     'alarm': ('CONNECTIVITY_ISSUE', 'MAJOR', "High connection failure rate")},
+    # Capacity overload: resource exhaustion
+    {'status': CellStatus.OVERLOADED, 'health_score': 0.7,
+     'scale': {'throughput': -0.3, 'latency': 1.5},
+     'shift': {'cpu_usage': 40, 'memory_usage': 30},
+     'cap': {'cpu_usage': 95.0, 'memory_usage': 95.0},
+     'alarm': ('CAPACITY_OVERLOAD', 'MAJOR', "Resource utilization critical")},
+    # Interference spike: RF problem
+    {'status': CellStatus.DEGRADED, 'health_score': 0.65,
+     'scale': {'throughput': -0.35},
+     'shift': {'interference': 0.4, 'sinr': -10},
+     'alarm': ('HIGH_INTERFERENCE', 'MAJOR', "Interference level above threshold")},
+)
+FAULT_ALARMS = tuple(effects['alarm'] for effects in FAULT_EFFECTS)
+
+# Fault severity multipliers, and per cell type (smaller cells are more sensitive)
+SEVERITY_MULTIPLIERS = {'low': 0.3, 'medium': 0.6, 'high': 0.85, 'critical': 1.0}
+CELL_TYPE_MULTIPLIERS = {'Macro': 0.8, 'Micro': 0.9, 'Pico': 1.0, 'Femto': 1.1}
+SEVERITY_CODES = {severity: code for code, severity in enumerate(SEVERITY_MULTIPLIERS)}
+
+# Healing actions that resolve each fault type; other fault types heal with any action
+VALID_HEALING_ACTIONS = {
+    FaultType.HARDWARE_FAILURE: frozenset({'restart', 'switch_to_backup'}),
+    FaultType.CONFIGURATION_ERROR: frozenset({'reset_config', 'apply_correct_config'}),
+    FaultType.PERFORMANCE_DEGRADATION: frozenset({'optimize_parameters', 'adjust_resources'}),
+    FaultType.CONNECTIVITY_ISSUE: frozenset({'restart_service', 'update_neighbor_list'}),
+    FaultType.CAPACITY_OVERLOAD: frozenset({'load_balancing', 'resource_expansion'}),
+    FaultType.INTERFERENCE_SPIKE: frozenset({'adjust_power', 'change_frequency'}),
+}
+_VALID_ACTIONS_BY_CODE = tuple(VALID_HEALING_ACTIONS.get(fault_type) for fault_type in FAULT_TYPES)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# FAULT_EFFECTS as arrays (fault type code x STATE_METRICS column), for the kernel
+_HEALTH_SCORE = METRIC_COLUMNS['health_score']
+_EFFECT_STATUS = np.array([effects['status'] for effects in FAULT_EFFECTS], dtype=np.int8)
+_EFFECT_HEALTH = np.array([effects['health_score'] for effects in FAULT_EFFECTS], dtype=float)
+_EFFECT_SCALE, _EFFECT_SHIFT, _EFFECT_CAP = (
+    np.array([[effects.get(part, {}).get(metric, default) for metric in STATE_METRICS]
+              for effects in FAULT_EFFECTS], dtype=float)
+    for part, default in (('scale', 0.0), ('shift', 0.0), ('cap', np.inf))
+)
+_EFFECT_NUM_USERS = np.array([effects.get('num_users_scale', 0.0) for effects in FAULT_EFFECTS])
+
+
+def _fault_effects_python(code, sev, m, num_users, status, row):
+    """
+    Apply the metric effects of a fault (FAULT_TYPE_CODES code, -1 = none) of
+    effective severity sev to one row of the state arrays; compiled with
+    Numba when available
+    """
+    if code < 0:
+        return
+
+    status[row] = _EFFECT_STATUS[code]
+    for column in range(m.shape[1]):
+        value = m[row, column] * (1 + _EFFECT_SCALE[code, column] * sev) + _EFFECT_SHIFT[code, column] * sev
+        if value > _EFFECT_CAP[code, column]:
+            value = _EFFECT_CAP[code, column]
+        m[row, column] = value
+    m[row, _HEALTH_SCORE] = _EFFECT_HEALTH[code]
+    num_users[row] = int(num_users[row] * (1 + _EFFECT_NUM_USERS[code] * sev))
+
+
+if NUMBA_AVAILABLE:
+    _fault_effects = njit(cache=True)(_fault_effects_python)
+else:
+    _fault_effects = _fault_effects_python
+
+
+def _fault_effects_batch_python(codes, sevs, m, num_users, status, rows):
+    """Apply the effects of a batch of faults, in order (see _fault_effects)"""
+    for i in range(codes.shape[0]):
+        _fault_effects(codes[i], sevs[i], m, num_users, status, rows[i])
+
+
+if NUMBA_AVAILABLE:
+    _fault_effects_batch = njit(cache=True)(_fault_effects_batch_python)
+else:
+    _fault_effects_batch = _fault_effects_batch_python
+
+
+class MetricCell(MutableMapping):
+    """
+    Cell of the environment, used like a dict
+    Its numeric state (STATE_METRICS, num_users) and status live in the
+    environment's arrays, at the cell's row, so vectorized updates of the
+    arrays are seen by every reader; other fields are kept in a plain dict.
+    Writes to the array-backed fields mark the cell dirty in the environment
+    """
+
+    __slots__ = ('_data', '_env', '_matrix', '_num_users', '_status', '_row')
+
+    def __init__(self, data, env, row):
+        # Array-backed fields keep their position in the key order, as None
+        self._data = {key: None if key in ARRAY_FIELDS else value for key, value in data.items()}
+        self._env = env
+        self._matrix = matrix = env.metric_matrix
+        self._num_users = num_users = env.metrics['num_users']
+        self._status = status = env.status_codes
+        self._row = row
+        matrix[row] = [data.get(metric, np.nan) for metric in STATE_METRICS]
+        num_users[row] = data.get('num_users', 0)
+        status[row] = STATUS_CODES[data.get('status', 'operational')]
+
+    def __getitem__(self, key):
+        column = METRIC_COLUMNS.get(key)
+        if column is not None:
+            return self._matrix.item(self._row, column)
+        if key == 'status':
+            return CELL_STATUSES[self._status[self._row]]
+        if key == 'num_users':
+            return self._num_users.item(self._row)
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        column = METRIC_COLUMNS.get(key)
+        if column is not None:
+            self._matrix[self._row, column] = value
+        elif key == 'status':
+            self._status[self._row] = STATUS_CODES[value]
+        elif key == 'num_users':
+            self._num_users[self._row] = value
+        else:
+            self._data[key] = value
+            return
+        self._env.mark_dirty(self._row)
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def copy(self):
+        """Plain dict snapshot of the cell"""
+        return {key: self[key] for key in self._data}
+
+    def __repr__(self):
+        return repr(self.copy())
+
+
 class NetworkHealingEnvironment:
     """
     Network environment with fault injection capabilities
@@ -45,11 +299,57 @@ class NetworkHealingEnvironment:
         self.random_seed = random_seed
         self.data_loader = None
 
+        # Generator for the per-step variations; without a seed it is seeded
+        # from NumPy's global generator, so seeding that still reproduces a run
+        self._rng = np.random.default_rng(
+            random_seed if random_seed is not None else np.random.randint(2**31))
+
         self.cells = []
-        self.active_faults = []
-        self.fault_history = []
         self.time_step = 0
 
+        # Resolved faults, the first _num_resolved rows of a FAULT_RECORD_DTYPE
+        # array (grown by doubling); read through fault_history
+        self._fault_records = np.zeros(INITIAL_FAULT_RECORDS, dtype=FAULT_RECORD_DTYPE)
+        self._num_resolved = 0
+        # Names of resolved faults whose type has no code, by record row
+        self._uncoded_fault_types = {}
+
+        # Active faults by fault id, in injection order, and per cell id
+        self.active_faults = {}
+        self.active_faults_by_cell = {}
+        self._next_fault_id = 0
+
+        # Cell state, structure of arrays (one row per cell): the float metrics
+        # (cells x STATE_METRICS, column-major so each metric is contiguous),
+        # num_users and status codes; self.metrics maps each field name to
+        # its 1-D array. The MetricCell views in self.cells read and write them
+        self.metric_matrix = np.empty((0, len(STATE_METRICS)), order='F')
+        self.metric_columns = METRIC_COLUMNS
+        self.status_codes = np.zeros(0, dtype=np.int8)
+        self.metrics = {}
+        self.cell_type_names = ()
+        self.cell_type_codes = np.zeros(0, dtype=np.int8)
+
+        # Effective fault severity by (SEVERITY_CODES, cell type code)
+        self.effective_severity = np.zeros((len(SEVERITY_CODES), 0))
+
+        # Healthy baseline per cell (BASELINE_METRICS), restored after healing
+        self.baselines = {}
+
+        # Network health summary, cached until a fault is injected or healed (or
+        # a cell is marked dirty); per-step variations leave it unchanged
+        self._health = None
+        self._cell_type_counts = {}
+
+        # Change counter per cell position, bumped whenever the cell's metrics
+        # change; each consumer (e.g. a fault detector) compares it with the
+        # counters it saw last, so no consumer hides changes from another
+        self.cell_versions = np.zeros(0, dtype=np.int64)
+
+        # Alarm types present per cell (ALARM_TYPE_BITS), 0 = no alarms; the
+        # alarm payloads stay in each cell's 'alarms' list
+        self.alarm_bits = np.zeros(0, dtype=np.uint32)
+
         # Initialize data loader if using real data
         if self.use_real_data:
             self._init_data_loader()
@@ -57,6 +357,15 @@ class NetworkHealingEnvironment:
         # Initialize network
         self._initialize_network()
 
+        # Warm up the compiled fault effects so the first injection doesn't pay for JIT
+        if NUMBA_AVAILABLE:
+            _fault_effects(-1, 0.0, np.zeros((2, len(STATE_METRICS)), order='F'),
+                           np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int8), 0)
+            _fault_effects_batch(np.full(1, -1, dtype=np.int64), np.zeros(1),
+                                 np.zeros((2, len(STATE_METRICS)), order='F'),
+                                 np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int8),
+                                 np.zeros(1, dtype=np.int64))
+
     def _init_data_loader(self):
         """Initialize the data loader for real data."""
         try:
@@ -79,6 +388,46 @@ class NetworkHealingEnvironment:
         else:
             self._initialize_simulated()
 
+        num_cells = len(self.cells)
+        self.metric_matrix = np.empty((num_cells, len(STATE_METRICS)), order='F')
+        self.status_codes = np.zeros(num_cells, dtype=np.int8)
+        self.metrics = {metric: self.metric_matrix[:, column] for metric, column in METRIC_COLUMNS.items()}
+        self.metrics['num_users'] = np.zeros(num_cells, dtype=np.int64)
+
+        # Cell type of each cell, as codes into cell_type_names (types in order of
+        # first appearance); cell types never change
+        cell_types = [cell.get('cell_type', 'Unknown') for cell in self.cells]
+        self.cell_type_names = tuple(dict.fromkeys(cell_types))
+        type_codes = {cell_type: code for code, cell_type in enumerate(self.cell_type_names)}
+        self.cell_type_codes = np.array([type_codes[cell_type] for cell_type in cell_types], dtype=np.int8)
+        self.effective_severity = np.outer(
+            list(SEVERITY_MULTIPLIERS.values()),
+            [CELL_TYPE_MULTIPLIERS.get(cell_type, 1.0) for cell_type in self.cell_type_names])
+        self.baselines = {
+            metric: np.array([cell.get(f'baseline_{metric}', default) for cell in self.cells], dtype=float)
+            for metric, default in BASELINE_METRICS.items()
+        }
+        self.cells = [
+            MetricCell(cell, self, i)
+            for i, cell in enumerate(self.cells)
+        ]
+
+        # Rebuilt cells start above every earlier counter, so consumers see them all as changed
+        self.cell_versions = np.full(len(self.cells), self.cell_versions.max(initial=0) + 1, dtype=np.int64)
+        self.alarm_bits = np.zeros(len(self.cells), dtype=np.uint32)
+
+        counts = np.bincount(self.cell_type_codes, minlength=len(self.cell_type_names))
+        self._cell_type_counts = dict(zip(self.cell_type_names, counts.tolist()))
+        self._health = None
+
+    def mark_dirty(self, cell_id):
+        """
+        Flag a cell whose metrics changed (done by the cells' own writes; only
+        needed after writing to the metric arrays directly)
+        """
+        self.cell_versions[cell_id] += 1
+        self._health = None
+
     def _initialize_from_real_data(self):
         """Initialize network using real data from CSV."""
         seed = self.random_seed if self.random_seed is not None else 42
@@ -135,37 +484,53 @@ class NetworkHealingEnvironment:
 
     def _initialize_simulated(self):
         """Create healthy network baseline using simulated data."""
-        for i in range(self.num_cells):
+        # One draw per field for the whole network
+        n = self.num_cells
+        rng = self._rng
+        cell_types = np.array(['Macro', 'Micro', 'Pico', 'Femto'])[rng.integers(0, 4, size=n)].tolist()
+        throughput = rng.uniform(45, 55, size=n).tolist()  # Mbps
+        latency = rng.uniform(10, 15, size=n).tolist()  # ms
+        packet_loss = rng.uniform(0, 0.5, size=n).tolist()  # %
+        interference = rng.uniform(0.05, 0.15, size=n).tolist()
+        sinr = rng.uniform(15, 25, size=n).tolist()  # dB
+        cpu_usage = rng.uniform(30, 50, size=n).tolist()  # %
+        memory_usage = rng.uniform(40, 60, size=n).tolist()  # %
+        temperature = rng.uniform(35, 45, size=n).tolist()  # Celsius
+        num_users = rng.integers(50, 150, size=n).tolist()
+        drop_rate = rng.uniform(0.01, 0.03, size=n).tolist()
+        qos_satisfaction = rng.uniform(75, 95, size=n).tolist()
+
+        for i in range(n):
             cell = {
                 'id': i,
                 'name': f"Cell_{i:03d}",
-                'cell_type': random.choice(['Macro', 'Micro', 'Pico', 'Femto']),
+                'cell_type': cell_types[i],
                 'status': 'operational',
                 'health_score': 1.0,
 
                 # Performance metrics
-                'throughput': np.random.uniform(45, 55),  # Mbps
-                'latency': np.random.uniform(10, 15),  # ms
-                'packet_loss': np.random.uniform(0, 0.5),  # %
+                'throughput': throughput[i],
+                'latency': latency[i],
+                'packet_loss': packet_loss[i],
                 'availability': 99.9,  # %
 
                 # RF metrics
                 'tx_power': 40.0,  # dBm
-                'interference': np.random.uniform(0.05, 0.15),
-                'sinr': np.random.uniform(15, 25),  # dB
+                'interference': interference[i],
+                'sinr': sinr[i],
 
                 # Resource metrics
-                'cpu_usage': np.random.uniform(30, 50),  # %
-                'memory_usage': np.random.uniform(40, 60),  # %
-                'temperature': np.random.uniform(35, 45),  # Celsius
+                'cpu_usage': cpu_usage[i],
+                'memory_usage': memory_usage[i],
+                'temperature': temperature[i],
 
                 # User metrics
-                'num_users': np.random.randint(50, 150),
-                'drop_rate': np.random.uniform(0.01, 0.03),
+                'num_users': num_users[i],
+                'drop_rate': drop_rate[i],
                 'handover_success': 98.5,
 
                 # Additional metrics
-                'qos_satisfaction': np.random.uniform(75, 95),
+                'qos_satisfaction': qos_satisfaction[i],
                 'frequency': 3.5,
                 'bandwidth': 100,
                 'optimized_action': 'Maintain_Power',
@@ -197,12 +562,14 @@ class NetworkHealingEnvironment:
         cell = self.cells[cell_id]
 
         fault = {
-            'id': len(self.fault_history),
+            'id': self._next_fault_id,
             'type': fault_type,
+            'type_code': FAULT_TYPE_CODES.get(fault_type, -1),
             'cell_id': cell_id,
             'cell_name': cell['name'],
             'cell_type': cell.get('cell_type', 'Unknown'),
             'severity': severity,
+            'severity_code': SEVERITY_CODES[severity],
             'start_time': self.time_step,
             'detected': False,
             'diagnosed': False,
@@ -212,113 +579,107 @@ class NetworkHealingEnvironment:
 
         # Apply fault effects to cell
         self._apply_fault_effects(cell, fault)
+        self.cell_versions[cell_id] += 1
+        self._health = None
+        self.alarm_bits[cell_id] = alarm_mask(cell['alarms'])
 
-        self.active_faults.append(fault)
+        self._next_fault_id += 1
+        self.active_faults[fault['id']] = fault
+        self.active_faults_by_cell.setdefault(cell_id, []).append(fault)
         cell['faults'].append(fault)
 
         return fault
 
-    def _apply_fault_effects(self, cell, fault):
-        """Apply realistic effects of fault on cell metrics"""
+    def inject_faults_batch(self, fault_types, cell_ids=None, severities='medium'):
+        """
+        Inject several faults at once; same result as calling inject_fault for
+        each fault in order, with the metric effects applied in one compiled pass
 
-        fault_type = fault['type']
-        severity_multiplier = {
-            'low': 0.3,
-            'medium': 0.6,
-            'high': 0.85,
-            'critical': 1.0
-        }[fault['severity']]
+        Args:
+            fault_types: Sequence of fault types (from FaultType class)
+            cell_ids: Sequence of cells, one per fault (None = random cells)
+            severities: One severity for all faults, or one per fault
 
-        # Cell type affects severity (smaller cells are more sensitive)
-        cell_type_multiplier = {
-            'Macro': 0.8,
-            'Micro': 0.9,
-            'Pico': 1.0,
-            'Femto': 1.1
-        }.get(cell.get('cell_type', 'Macro'), 1.0)
-
-        effective_severity = severity_multiplier * cell_type_multiplier
-
-        if fault_type == FaultType.HARDWARE_FAILURE:
-            # Hardware failure: severe impact on all metrics
-            cell['status'] = 'failed'
-            cell['health_score'] = 0.1
-            cell['throughput'] *= (1 - 0.9 * effective_severity)
-            cell['latency'] *= (1 + 5 * effective_severity)
-            cell['packet_loss'] += 10 * effective_severity
-            cell['availability'] -= 20 * effective_severity
-            cell['alarms'].append({
-                'type': 'HARDWARE_FAULT',
-                'severity': 'CRITICAL',
-                'message': f"Hardware component failure detected in {cell.get('cell_type', 'Unknown')} cell"
-            })
+        Returns:
+            List of the injected faults
+        """
+        num_faults = len(fault_types)
+        if cell_ids is None:
+            cell_ids = self._rng.integers(0, self.num_cells, size=num_faults)
+        cell_ids = np.asarray(cell_ids, dtype=np.int64)
+        if isinstance(severities, str):
+            severities = [severities] * num_faults
+        if len(cell_ids) != num_faults or len(severities) != num_faults:
+            raise ValueError("fault_types, cell_ids and severities must have the same length")
+
+        codes = np.array([FAULT_TYPE_CODES.get(fault_type, -1) for fault_type in fault_types],
+                         dtype=np.int64)
+        severity_codes = np.array([SEVERITY_CODES[severity] for severity in severities], dtype=np.int64)
+        effective_severities = self.effective_severity[severity_codes, self.cell_type_codes[cell_ids]]
+
+        _fault_effects_batch(codes, effective_severities, self.metric_matrix,
+                             self.metrics['num_users'], self.status_codes, cell_ids)
+        self._health = None
+
+        faults = []
+        for fault_type, cell_id, severity, code, severity_code in zip(
+                fault_types, cell_ids.tolist(), severities, codes.tolist(), severity_codes.tolist()):
+            cell = self.cells[cell_id]
+            fault = {
+                'id': self._next_fault_id,
+                'type': fault_type,
+                'type_code': code,
+                'cell_id': cell_id,
+                'cell_name': cell['name'],
+                'cell_type': cell.get('cell_type', 'Unknown'),
+                'severity': severity,
+                'severity_code': severity_code,
+                'start_time': self.time_step,
+                'detected': False,
+                'diagnosed': False,
+                'healed': False,
+                'end_time': None
+            }
+            if code >= 0:
+                alarm_type, alarm_severity, message = FAULT_ALARMS[code]
+                cell['alarms'].append({
+                    'type': alarm_type,
+                    'severity': alarm_severity,
+                    'message': message.format(cell_type=fault['cell_type'])
+                })
+
+            self._next_fault_id += 1
+            self.active_faults[fault['id']] = fault
+            self.active_faults_by_cell.setdefault(cell_id, []).append(fault)
+            cell['faults'].append(fault)
+            faults.append(fault)
+
+        for cell_id in set(cell_ids.tolist()):
+            self.cell_versions[cell_id] += 1
+            self.alarm_bits[cell_id] = alarm_mask(self.cells[cell_id]['alarms'])
+
+        return faults
 
-        elif fault_type == FaultType.CONFIGURATION_ERROR:
-            # Config error: impacts connectivity and performance
-            cell['status'] = 'degraded'
-            cell['health_score'] = 0.4
-            cell['throughput'] *= (1 - 0.4 * effective_severity)
-            cell['handover_success'] -= 15 * effective_severity
-            cell['drop_rate'] += 0.05 * effective_severity
-            cell['alarms'].append({
-                'type': 'CONFIG_ERROR',
-                'severity': 'MAJOR',
-                'message': f"Configuration mismatch detected"
-            })
+    def _apply_fault_effects(self, cell, fault):
+        """Apply realistic effects of fault on cell metrics"""
 
-        elif fault_type == FaultType.PERFORMANCE_DEGRADATION:
-            # Performance degradation: gradual decline
-            cell['status'] = 'degraded'
-            cell['health_score'] = 0.5
-            cell['throughput'] *= (1 - 0.5 * effective_severity)
-            cell['latency'] *= (1 + 2 * effective_severity)
-            cell['packet_loss'] += 3 * effective_severity
-            cell['qos_satisfaction'] *= (1 - 0.3 * effective_severity)
-            cell['alarms'].append({
-                'type': 'PERFORMANCE_DEGRADED',
-                'severity': 'MAJOR',
-                'message': f"Performance below threshold"
-            })
+        code = fault['type_code']
+        if code < 0:
+            return
 
-        elif fault_type == FaultType.CONNECTIVITY_ISSUE:
-            # Connectivity issue: affects user connections
-            cell['status'] = 'degraded'
-            cell['health_score'] = 0.6
-            cell['drop_rate'] += 0.1 * effective_severity
-            cell['handover_success'] -= 20 * effective_severity
-            cell['num_users'] = int(cell['num_users'] * (1 - 0.4 * effective_severity))
-            cell['alarms'].append({
-                'type': 'CONNECTIVITY_ISSUE',
-                'severity': 'MAJOR',
-                'message': f"High connection failure rate"
-            })
+        # Cell type affects severity (smaller cells are more sensitive)
+        row = cell['id']
+        effective_severity = self.effective_severity[fault['severity_code'], self.cell_type_codes[row]]
 
-        elif fault_type == FaultType.CAPACITY_OVERLOAD:
-            # Capacity overload: resource exhaustion
-            cell['status'] = 'overloaded'
-            cell['health_score'] = 0.7
-            cell['cpu_usage'] = min(95, cell['cpu_usage'] + 40 * effective_severity)
-            cell['memory_usage'] = min(95, cell['memory_usage'] + 30 * effective_severity)
-            cell['throughput'] *= (1 - 0.3 * effective_severity)
-            cell['latency'] *= (1 + 1.5 * effective_severity)
-            cell['alarms'].append({
-                'type': 'CAPACITY_OVERLOAD',
-                'severity': 'MAJOR',
-                'message': f"Resource utilization critical"
-            })
+        _fault_effects(code, effective_severity, self.metric_matrix,
+                       self.metrics['num_users'], self.status_codes, row)
 
-        elif fault_type == FaultType.INTERFERENCE_SPIKE:
-            # Interference spike: RF problem
-            cell['status'] = 'degraded'
-            cell['health_score'] = 0.65
-            cell['interference'] += 0.4 * effective_severity
-            cell['sinr'] -= 10 * effective_severity
-            cell['throughput'] *= (1 - 0.35 * effective_severity)
-            cell['alarms'].append({
-                'type': 'HIGH_INTERFERENCE',
-                'severity': 'MAJOR',
-                'message': f"Interference level above threshold"
-            })
+        alarm_type, alarm_severity, message = FAULT_ALARMS[code]
+        cell['alarms'].append({
+            'type': alarm_type,
+            'severity': alarm_severity,
+            'message': message.format(cell_type=cell.get('cell_type', 'Unknown'))
+        })
 
     def heal_fault(self, fault_id, healing_action):
         """
@@ -333,7 +694,7 @@ class NetworkHealingEnvironment:
         """
 
         # Find the fault
-        fault = next((f for f in self.active_faults if f['id'] == fault_id), None)
+        fault = self.active_faults.get(fault_id)
         if not fault:
             return False
 
@@ -343,123 +704,205 @@ class NetworkHealingEnvironment:
         success = self._apply_healing_action(cell, fault, healing_action)
 
         if success:
-            # Mark fault as healed
-            fault['healed'] = True
-            fault['end_time'] = self.time_step
-            fault['healing_action'] = healing_action
-
-            # Remove from active faults
-            self.active_faults.remove(fault)
-
-            # Move to history
-            self.fault_history.append(fault)
+            self._resolve_fault(fault, healing_action)
 
             # Restore cell health
             self._restore_cell_health(cell, fault)
 
         return success
 
-    def _apply_healing_action(self, cell, fault, action):
-        """Apply specific healing action"""
-
-        action_type = action.get('type', 'generic')
-
-        # Different healing actions for different fault types
-        if fault['type'] == FaultType.HARDWARE_FAILURE:
-            if action_type in ['restart', 'switch_to_backup']:
-                return True  # Healing successful
-            return False
+    def heal_faults_batch(self, ids_and_actions):
+        """
+        Apply several healing actions at once; the healed cells are restored
+        together, with one random draw per metric for the whole batch
 
-        elif fault['type'] == FaultType.CONFIGURATION_ERROR:
-            if action_type in ['reset_config', 'apply_correct_config']:
-                return True
-            return False
+        Args:
+            ids_and_actions: Iterable of (fault_id, healing_action) pairs
 
-        elif fault['type'] == FaultType.PERFORMANCE_DEGRADATION:
-            if action_type in ['optimize_parameters', 'adjust_resources']:
-                return True
-            return False
+        Returns:
+            List of booleans, whether each healing was successful
+        """
+        results = []
+        healed = []
+        for fault_id, healing_action in ids_and_actions:
+            fault = self.active_faults.get(fault_id)
+            success = bool(fault) and self._apply_healing_action(
+                self.cells[fault['cell_id']], fault, healing_action)
+            if success:
+                self._resolve_fault(fault, healing_action)
+                healed.append(fault)
+            results.append(success)
+
+        if healed:
+            self._restore_cells(np.unique([fault['cell_id'] for fault in healed]))
+            for fault in healed:
+                self._clear_fault(self.cells[fault['cell_id']], fault)
+
+        return results
+
+    def _resolve_fault(self, fault, healing_action):
+        """Mark a fault as healed and move it from the active faults to the history"""
+        fault['healed'] = True
+        fault['end_time'] = self.time_step
+        fault['healing_action'] = healing_action
+
+        # Remove from active faults
+        self._health = None
+        del self.active_faults[fault['id']]
+        cell_faults = self.active_faults_by_cell[fault['cell_id']]
+        cell_faults.remove(fault)
+        if not cell_faults:
+            del self.active_faults_by_cell[fault['cell_id']]
+
+        # Move to history
+        self._record_fault(fault)
+
+    def _record_fault(self, fault):
+        """Append a resolved fault to the fault records (doubling them when full)"""
+        if self._num_resolved == len(self._fault_records):
+            records = np.zeros(2 * len(self._fault_records), dtype=FAULT_RECORD_DTYPE)
+            records[:self._num_resolved] = self._fault_records
+            self._fault_records = records
+
+        if fault['type_code'] < 0:
+            self._uncoded_fault_types[self._num_resolved] = fault['type']
+        self._fault_records[self._num_resolved] = (
+            fault['id'], fault['type_code'], fault['cell_id'], fault['severity_code'],
+            fault['start_time'], fault['end_time'],
+            fault['detected'], fault['diagnosed'], fault['healed'],
+        )
+        self._num_resolved += 1
 
-        elif fault['type'] == FaultType.CONNECTIVITY_ISSUE:
-            if action_type in ['restart_service', 'update_neighbor_list']:
-                return True
-            return False
+    @property
+    def fault_history(self):
+        """
+        Resolved faults, in resolution order, as a FAULT_RECORD_DTYPE array (a view).
+        This used to be a list of the fault dicts; get_fault_history() still
+        returns them in that form
+        """
+        return self._fault_records[:self._num_resolved]
 
-        elif fault['type'] == FaultType.CAPACITY_OVERLOAD:
-            if action_type in ['load_balancing', 'resource_expansion']:
-                return True
-            return False
+    def get_fault_history(self):
+        """
+        Resolved faults, in resolution order, as fault dicts (type and severity
+        names, cell name and type); the healing action is not kept in the history
+        """
+        severities = tuple(SEVERITY_CODES)
+        history = []
+        for row, (fault_id, code, cell_id, severity_code, start_time, end_time,
+                  detected, diagnosed, healed) in enumerate(self.fault_history.tolist()):
+            cell = self.cells[cell_id]
+            history.append({
+                'id': fault_id,
+                'type': FAULT_TYPES[code] if code >= 0 else self._uncoded_fault_types[row],
+                'type_code': code,
+                'cell_id': cell_id,
+                'cell_name': cell['name'],
+                'cell_type': cell.get('cell_type', 'Unknown'),
+                'severity': severities[severity_code],
+                'severity_code': severity_code,
+                'start_time': start_time,
+                'detected': detected,
+                'diagnosed': diagnosed,
+                'healed': healed,
+                'end_time': end_time
+            })
+        return history
 
-        elif fault['type'] == FaultType.INTERFERENCE_SPIKE:
-            if action_type in ['adjust_power', 'change_frequency']:
-                return True
-            return False
+    def _apply_healing_action(self, cell, fault, action):
+        """Apply specific healing action"""
 
-        return True  # Default: healing successful
+        code = fault['type_code']
+        valid_actions = _VALID_ACTIONS_BY_CODE[code] if code >= 0 else None
+        if valid_actions is None:
+            return True  # Default: healing successful
+        return action.get('type', 'generic') in valid_actions
 
     def _restore_cell_health(self, cell, fault):
         """Restore cell to healthy state after healing"""
+        self._restore_cells(np.array([cell['id']]))
+        self._clear_fault(cell, fault)
+
+    def _restore_cells(self, rows):
+        """Restore the metrics of cells (array of cell ids) to a healthy baseline"""
+        rng = self._rng
+        metrics = self.metrics
+        n = len(rows)
 
-        # Restore to healthy baseline
-        cell['status'] = 'operational'
-        cell['health_score'] = 1.0
+        self.status_codes[rows] = CellStatus.OPERATIONAL
+        metrics['health_score'][rows] = 1.0
 
         if self.use_real_data:
             # Restore to baseline from real data
-            cell['throughput'] = cell.get('baseline_throughput', 50.0) * np.random.uniform(0.95, 1.05)
-            cell['latency'] = cell.get('baseline_latency', 12.5) * np.random.uniform(0.95, 1.05)
-            cell['packet_loss'] = cell.get('baseline_packet_loss', 0.25) * np.random.uniform(0.95, 1.05)
+            for metric, baseline in self.baselines.items():
+                metrics[metric][rows] = baseline[rows] * rng.uniform(0.95, 1.05, size=n)
         else:
             # Restore metrics to healthy ranges
-            cell['throughput'] = np.random.uniform(45, 55)
-            cell['latency'] = np.random.uniform(10, 15)
-            cell['packet_loss'] = np.random.uniform(0, 0.5)
+            metrics['throughput'][rows] = rng.uniform(45, 55, size=n)
+            metrics['latency'][rows] = rng.uniform(10, 15, size=n)
+            metrics['packet_loss'][rows] = rng.uniform(0, 0.5, size=n)
 
-        cell['availability'] = 99.9
+        metrics['availability'][rows] = 99.9
 
-        cell['cpu_usage'] = np.random.uniform(30, 50)
-        cell['memory_usage'] = np.random.uniform(40, 60)
-        cell['temperature'] = np.random.uniform(35, 45)
+        metrics['cpu_usage'][rows] = rng.uniform(30, 50, size=n)
+        metrics['memory_usage'][rows] = rng.uniform(40, 60, size=n)
+        metrics['temperature'][rows] = rng.uniform(35, 45, size=n)
 
-        cell['drop_rate'] = np.random.uniform(0.01, 0.03)
-        cell['handover_success'] = 98.5
+        metrics['drop_rate'][rows] = rng.uniform(0.01, 0.03, size=n)
+        metrics['handover_success'][rows] = 98.5
 
-        cell['interference'] = np.random.uniform(0.05, 0.15)
-        cell['sinr'] = np.random.uniform(15, 25)
+        metrics['interference'][rows] = rng.uniform(0.05, 0.15, size=n)
+        metrics['sinr'][rows] = rng.uniform(15, 25, size=n)
 
+        self.cell_versions[rows] += 1
+        self._health = None
+
+    def _clear_fault(self, cell, fault):
+        """Drop a healed fault and its alarms from its cell"""
         # Clear alarms related to this fault
         cell['alarms'] = [a for a in cell['alarms'] if a.get('fault_id') != fault['id']]
         cell['faults'].remove(fault)
 
+        self.alarm_bits[cell['id']] = alarm_mask(cell['alarms'])
+
     def get_network_health(self):
         """Calculate overall network health"""
 
-        total_health = sum(cell['health_score'] for cell in self.cells)
-        avg_health = total_health / self.num_cells
+        result = dict(self._network_health())
+
+        if self.use_real_data:
+            # Add cell type distribution
+            result['cell_types'] = dict(self._cell_type_counts)
+
+        return result
+
+    @property
+    def average_health(self):
+        """Average health score of the cells (cached like get_network_health)"""
+        return self._network_health()['average_health']
 
-        num_failed = sum(1 for cell in self.cells if cell['status'] == 'failed')
-        num_degraded = sum(1 for cell in self.cells if cell['status'] == 'degraded')
-        num_operational = sum(1 for cell in self.cells if cell['status'] == 'operational')
+    def _network_health(self):
+        """Network health summary, recomputed only after the cell health changed"""
+        if self._health is not None:
+            return self._health
 
-        result = {
+        total_health = self.metrics['health_score'].sum()
+        avg_health = float(total_health / self.num_cells)
+
+        # Cells per status, in CELL_STATUSES order
+        num_operational, num_degraded, num_failed, _ = np.bincount(
+            self.status_codes, minlength=len(CELL_STATUSES)).tolist()
+
+        self._health = {
             'average_health': avg_health,
             'operational_cells': num_operational,
             'degraded_cells': num_degraded,
             'failed_cells': num_failed,
             'active_faults': len(self.active_faults),
-            'total_faults_resolved': len(self.fault_history),
+            'total_faults_resolved': self._num_resolved,
             'data_mode': 'real_data' if self.use_real_data else 'simulated'
         }
-
-        if self.use_real_data:
-            # Add cell type distribution
-            cell_types = {}
-            for cell in self.cells:
-                ct = cell.get('cell_type', 'Unknown')
-                cell_types[ct] = cell_types.get(ct, 0) + 1
-            result['cell_types'] = cell_types
-
-        return result
+        return self._health
 
     def get_cell_metrics(self, cell_id):
         """Get all metrics for a specific cell"""
@@ -469,25 +912,43 @@ class NetworkHealingEnvironment:
         """Advance time by one step"""
         self.time_step += 1
 
-        # Add small random variations to healthy cells
-        for cell in self.cells:
-            if cell['status'] == 'operational':
-                cell['throughput'] += np.random.uniform(-2, 2)
-                cell['latency'] += np.random.uniform(-1, 1)
-                cell['cpu_usage'] += np.random.uniform(-5, 5)
-                cell['num_users'] += np.random.randint(-10, 10)
-
-                # Clamp values
-                cell['throughput'] = max(0, min(1000, cell['throughput']))
-                cell['latency'] = max(5, cell['latency'])
-                cell['cpu_usage'] = max(0, min(100, cell['cpu_usage']))
-                cell['num_users'] = max(0, cell['num_users'])
+        # Add small random variations to healthy cells, one draw per metric
+        # for all of them, then clamp values
+        healthy = np.flatnonzero(self.status_codes == CellStatus.OPERATIONAL)
+        if not len(healthy):
+            return
+        self.cell_versions[healthy] += 1
+
+        rng = self._rng
+        n = len(healthy)
+        metrics = self.metrics
+
+        # With every cell healthy the columns are updated in place, otherwise
+        # the healthy rows are gathered, updated in place and written back
+        all_healthy = n == len(self.status_codes)
+        rows = slice(None) if all_healthy else healthy
+        for metric, (low, high), (lower, upper) in STEP_VARIATIONS:
+            values = metrics[metric][rows]
+            values += rng.uniform(low, high, n)
+            np.clip(values, lower, upper, out=values)
+            if not all_healthy:
+                metrics[metric][rows] = values
+
+        num_users = metrics['num_users'][rows]
+        num_users += rng.integers(-10, 10, n)
+        np.maximum(num_users, 0, out=num_users)
+        if not all_healthy:
+            metrics['num_users'][rows] = num_users
 
     def reset(self):
         """Reset the environment to initial state"""
         self.cells = []
-        self.active_faults = []
-        self.fault_history = []
+        self.active_faults = {}
+        self.active_faults_by_cell = {}
+        self._next_fault_id = 0
+        self._fault_records = np.zeros(INITIAL_FAULT_RECORDS, dtype=FAULT_RECORD_DTYPE)
+        self._num_resolved = 0
+        self._uncoded_fault_types = {}
         self.time_step = 0
         self._initialize_network()
 
@@ -7,6 +7,10 @@ Each vendor's AI operates independently, creating potential conflicts
 import numpy as np
 
 
+VENDORS = ('ericsson', 'nokia', 'huawei')
+VENDOR_CODES = {vendor: code for code, vendor in enumerate(VENDORS)}
+
+
 class MultiVendorEnvironment:
     """
     Simulates a multi-vendor RAN network
@@ -25,10 +29,25 @@ class MultiVendorEnvironment:
         # Track history for conflict detection
         self.history = []
 
+        # Change counter per cell id, bumped whenever the cell's configuration
+        # changes; each consumer (e.g. a coordinator) compares it with the
+        # counters it saw last, so no consumer hides changes from another
+        self.cell_versions = np.zeros(num_cells, dtype=np.int64)
+
+        # Structure-of-Arrays snapshot of the cells (see _refresh_soa)
+        self.soa = {}
+        self._refresh_soa()
+
+        # Cell positions never move: cache the interference path-loss term
+        dx = self.soa['x'][:, None] - self.soa['x'][None, :]
+        dy = self.soa['y'][:, None] - self.soa['y'][None, :]
+        distance = np.sqrt(dx**2 + dy**2) + 0.1  # Avoid division by zero
+        self._interference_scale = 100 * distance**2
+
     def _initialize_cells(self):
         """Initialize cells and assign to vendors"""
 
-        vendors = ['ericsson', 'nokia', 'huawei']
+        vendors = list(VENDORS)
         vendor_colors = {
             'ericsson': '#0033A0',  # Ericsson blue
             'nokia': '#124191',      # Nokia blue
@@ -81,6 +100,7 @@ class MultiVendorEnvironment:
         self._initialize_cells()
         self.current_step = 0
         self.history = []
+        self.cell_versions += 1
         return self._get_state()
 
     def _get_state(self):
@@ -97,6 +117,10 @@ class MultiVendorEnvironment:
             ])
         return np.array(state, dtype=np.float32)
 
+    def mark_dirty(self, cell_id):
+        """Flag a cell whose configuration was changed outside apply_action(s_batch)"""
+        self.cell_versions[cell_id] += 1
+
     def get_cells_by_vendor(self, vendor):
         """Get all cells belonging to a specific vendor"""
         return [cell for cell in self.cells if cell['vendor'] == vendor]
@@ -131,6 +155,20 @@ class MultiVendorEnvironment:
 
         return neighbors
 
+    def _refresh_soa(self):
+        """
+        Rebuild the Structure-of-Arrays view of the cells
+        One contiguous array per field, indexed by cell id, for vectorized analysis
+        """
+        self.soa = {
+            'tx_power': np.fromiter((c['tx_power'] for c in self.cells), dtype=float, count=self.num_cells),
+            'num_users': np.fromiter((c['num_users'] for c in self.cells), dtype=np.float32, count=self.num_cells),
+            'vendor': np.fromiter((VENDOR_CODES[c['vendor']] for c in self.cells), dtype=np.int8, count=self.num_cells),
+            'x': np.fromiter((c['x'] for c in self.cells), dtype=float, count=self.num_cells),
+            'y': np.fromiter((c['y'] for c in self.cells), dtype=float, count=self.num_cells)
+        }
+        return self.soa
+
     def calculate_interference(self, cell_a_id, cell_b_id):
         """Calculate interference between two cells"""
         cell_a = self.cells[cell_a_id]
@@ -146,6 +184,15 @@ class MultiVendorEnvironment:
 
         return interference
 
+    def calculate_interference_matrix(self):
+        """
+        Interference between every pair of cells
+        Same formula as calculate_interference, for the whole grid at once
+        (also refreshes the Structure-of-Arrays snapshot)
+        """
+        power = self._refresh_soa()['tx_power']
+        return np.outer(power, power) / self._interference_scale
+
     def apply_action(self, cell_id, action_params):
         """Apply configuration changes to a cell"""
         cell = self.cells[cell_id]
@@ -173,10 +220,60 @@ class MultiVendorEnvironment:
 
         # Update power consumption
         cell['power_consumption'] = cell['tx_power'] * 0.5
+        self.cell_versions[cell_id] += 1
 
         # Recalculate metrics
         self._update_cell_metrics(cell_id)
 
+    def apply_actions_batch(self, power_delta, ho_delta, mask):
+        """
+        Apply power and handover-threshold changes to many cells at once
+
+        All changes are applied first, then interference, throughput and drop
+        rate of the updated cells are recomputed once from the final power
+        levels. Calling apply_action per cell recomputes each cell right after
+        its own change, so it sees the old power of cells updated after it;
+        the two orders give slightly different metrics (mostly interference).
+
+        Args:
+            power_delta: Power change per cell id (dB)
+            ho_delta: Handover threshold change per cell id (dB)
+            mask: Boolean array, True for the cells to update
+        """
+        ids = np.nonzero(mask)[0]
+        if len(ids) == 0:
+            return
+
+        power = np.fromiter((self.cells[i]['tx_power'] for i in ids), dtype=float, count=len(ids))
+        threshold = np.fromiter((self.cells[i]['handover_threshold'] for i in ids), dtype=float, count=len(ids))
+        power = np.clip(power + power_delta[ids], 30, 46)  # Power limits
+        threshold = np.clip(threshold + ho_delta[ids], 50, 90)
+
+        for cell_id, cell_power, cell_threshold in zip(ids.tolist(), power.tolist(), threshold.tolist()):
+            cell = self.cells[cell_id]
+            cell['tx_power'] = cell_power
+            cell['handover_threshold'] = cell_threshold
+            cell['power_consumption'] = cell_power * 0.5
+        self.cell_versions[ids] += 1
+
+        # Recalculate metrics of the updated cells from the new power levels
+        interference = self.calculate_interference_matrix()
+        total_interference = interference[ids].sum(axis=1) - interference[ids, ids]
+
+        # Throughput based on power and interference (simplified Shannon)
+        sinr = power / (20 + total_interference * 100)
+        throughput = np.clip(20 * np.log2(1 + sinr), 10, 100)
+
+        # Drop rate inversely related to SINR
+        drop_rate = np.clip(0.1 / (1 + sinr), 0.01, 0.15)
+
+        for cell_id, cell_interference, cell_throughput, cell_drop in zip(
+                ids.tolist(), total_interference.tolist(), throughput.tolist(), drop_rate.tolist()):
+            cell = self.cells[cell_id]
+            cell['interference'] = cell_interference
+            cell['throughput'] = cell_throughput
+            cell['drop_rate'] = cell_drop
+
     def _update_cell_metrics(self, cell_id):
         """Update cell performance metrics after configuration change"""
         cell = self.cells[cell_id]
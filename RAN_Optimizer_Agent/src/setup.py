@@ -0,0 +1,19 @@
+"""
+Optional ahead-of-time build of the coordination agent with Cython
+
+    cd src
+    python setup.py build_ext --inplace
+
+Python then imports the compiled extension instead of coordination_agent.py;
+delete the built extension (.so/.pyd) to go back to the pure-Python module.
+Requires Cython and a C compiler.
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name='ran-coordination-agent',
+    ext_modules=cythonize('coordination_agent.py'),
+    zip_safe=False
+)
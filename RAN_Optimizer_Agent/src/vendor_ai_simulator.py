@@ -239,6 +239,7 @@ class IndependentVendorSimulation:
 
 if __name__ == "__main__":
     from multi_vendor_environment import MultiVendorEnvironment
+    from coordination_agent import describe_conflict
 
     print("Testing Vendor AI Simulators...")
 
@@ -270,7 +271,7 @@ if __name__ == "__main__":
         print(f"    Conflicts detected: {len(result['conflicts'])}")
         if result['conflicts']:
             for conflict in result['conflicts']:
-                print(f"      - {conflict['type']}: {conflict['description']}")
+                print(f"      - {conflict['type']}: {describe_conflict(conflict)}")
 
     print("\n  Final stats:", env2.get_network_stats())
     print(f"\n✅ Vendor AI Simulators working!")
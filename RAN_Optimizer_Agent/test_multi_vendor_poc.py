@@ -6,6 +6,8 @@ Run this to verify everything works before launching web demo
 import sys
 import os
 
+import numpy as np
+
 # Simple ASCII checkmarks for Windows compatibility
 CHECK = "[OK]"
 CROSS = "[X]"
@@ -94,10 +96,47 @@ def test_coordination_agent():
     print("\n[PASS] Coordination agent test PASSED")
     return True
 
+def test_incremental_conflict_detection():
+    """Test that re-detecting only changed cells matches a full detection"""
+    print("\n" + "="*60)
+    print("TEST 4: Incremental Conflict Detection")
+    print("="*60)
+
+    env = MultiVendorEnvironment(num_cells=48)
+
+    def full_detection():
+        # A fresh agent has no cached pair flags, so it checks every pair
+        return MultiVendorCoordinationAgent(env, {}).detect_conflicts()
+
+    coordinator = MultiVendorCoordinationAgent(env, {})
+    coordinator.detect_conflicts()
+
+    # Direct cell mutation, reported through env.mark_dirty
+    for cell_id in (15, 19):
+        env.cells[cell_id]['tx_power'] = 44.0
+        env.mark_dirty(cell_id)
+    env.cells[15]['num_users'] = 20
+    incremental = coordinator.detect_conflicts()
+    assert incremental == full_detection(), "Mismatch after direct cell mutation"
+    print(f"[OK] Direct mutation: {len(incremental)} conflicts match full detection")
+
+    # Batched coordinated actions
+    mask = np.zeros(env.num_cells, dtype=bool)
+    mask[[13, 17, 30]] = True
+    power_delta = np.full(env.num_cells, 10.0)
+    ho_delta = np.full(env.num_cells, -5.0)
+    env.apply_actions_batch(power_delta, ho_delta, mask)
+    incremental = coordinator.detect_conflicts()
+    assert incremental == full_detection(), "Mismatch after apply_actions_batch"
+    print(f"[OK] Batched actions: {len(incremental)} conflicts match full detection")
+
+    print("\n[PASS] Incremental conflict detection test PASSED")
+    return True
+
 def test_comparison():
     """Test full comparison"""
     print("\n" + "="*60)
-    print("TEST 4: Full Comparison (This takes ~10 seconds)")
+    print("TEST 5: Full Comparison (This takes ~10 seconds)")
     print("="*60)
 
     comparison = CoordinationComparison.run_comparison(num_cells=12, num_steps=5)
@@ -131,6 +170,7 @@ def run_all_tests():
         ("Environment", test_environment),
         ("Vendor AIs", test_vendor_ais),
         ("Coordination Agent", test_coordination_agent),
+        ("Incremental Detection", test_incremental_conflict_detection),
         ("Full Comparison", test_comparison)
     ]
 